@@ -58,6 +58,9 @@ const JournalView = () => {
     );
   }
 
+  // Manuscripts under review are access checked by the backend, iframes can't send headers so the token goes in the URL
+  const manuscriptUrl = `${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}?token=${encodeURIComponent(localStorage.getItem('token') || '')}`;
+
   return (
     <div className="container mt-4">
       <div className="row p-4 pb-0 pe-lg-0 pt-lg-5 align-items-center rounded-3 border shadow-lg mb-4">
@@ -84,7 +87,7 @@ const JournalView = () => {
               {showPdf ? 'Hide Manuscript' : 'View Manuscript'}
             </button>
             <a
-              href={`${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}`}
+              href={manuscriptUrl}
               className="btn btn-outline-secondary btn-sm px-4"
               target="_blank"
               rel="noopener noreferrer"
@@ -99,7 +102,7 @@ const JournalView = () => {
               {journal.manuscript_file ? (
                 <iframe 
                   key={iframeKey}
-                  src={`${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}#view=fitH`}
+                  src={`${manuscriptUrl}#view=fitH`}
                   title="Journal Manuscript"
                   width="100%"
                   height="100%"
@@ -107,7 +110,7 @@ const JournalView = () => {
                   onError={() => console.error('Failed to load PDF')}
                 >
                   <p>Your browser does not support iframes. 
-                    <a href={`${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}`} download>Download PDF instead</a>
+                    <a href={manuscriptUrl} download>Download PDF instead</a>
                   </p>
                 </iframe>
               ) : (
@@ -247,7 +247,7 @@ const ReviewRecommendation = () => {
                               size="sm"
                               className="mt-1"
                               as="a"
-                              href={`${import.meta.env.VITE_BACKEND_DJANGO_URL}${feedback.file_upload}`}
+                              href={`${import.meta.env.VITE_BACKEND_DJANGO_URL}${feedback.file_upload}?token=${encodeURIComponent(localStorage.getItem('token') || '')}`}
                               download
                               target="_blank"
                               rel="noopener noreferrer"
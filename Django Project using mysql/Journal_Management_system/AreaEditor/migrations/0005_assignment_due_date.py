@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:23
+
+import AreaEditor.models
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_existing_due_dates(apps, schema_editor):
+    # Existing rows got the migration time as default, their deadline is counted from the assignment instead
+    AreaEditorJournalAssignment = apps.get_model('AreaEditor', 'AreaEditorJournalAssignment')
+    AreaEditorJournalAssignment.objects.update(due_date=F('assigned_date') + timedelta(days=14))  # AreaEditor.models.HANDLING_PERIOD at the time of writing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AreaEditor', '0004_areaeditorrecommendation'),
+        ('journal', '0015_journalstatusrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='areaeditorjournalassignment',
+            name='due_date',
+            field=models.DateTimeField(blank=True, default=AreaEditor.models.get_handling_due_date, null=True),
+        ),
+        migrations.AddField(
+            model_name='areaeditorjournalassignment',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_existing_due_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='areaeditorjournalassignment',
+            index=models.Index(fields=['status', 'due_date'], name='ae_assignment_status_due_idx'),
+        ),
+    ]
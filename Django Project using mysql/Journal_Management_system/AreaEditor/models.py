@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from journal.models import SubjectArea, JournalSection,Journal
 
@@ -55,7 +57,13 @@ class EducationDetailOfAreaEditor(models.Model):
     def __str__(self):
         return f"{self.degree} in {self.field_of_study} from {self.institution}"
     
+HANDLING_PERIOD = timedelta(days=14)  # time an area editor gets to handle a manuscript
+
+def get_handling_due_date():
+    return timezone.now() + HANDLING_PERIOD
+
 class AreaEditorJournalAssignment(models.Model):
+    OPEN_STATUSES = ['assigned', 'in_progress']  # statuses the overdue sweeper reminds about
     STATUS_CHOICES = [
         ('assigned', 'Assigned'),
         ('in_progress', 'In Progress'),
@@ -66,9 +74,16 @@ class AreaEditorJournalAssignment(models.Model):
     area_editor = models.ForeignKey(AreaEditor, on_delete=models.CASCADE)
     assigned_date = models.DateTimeField(auto_now_add=True)
     completed_date = models.DateTimeField(null=True, blank=True)
+    due_date = models.DateTimeField(default=get_handling_due_date, null=True, blank=True)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)  # set by the overdue sweeper so every assignment is reminded once
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='assigned')
     notes = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='ae_assignment_status_due_idx'),  # overdue sweeper range scans
+        ]
+
     def __str__(self):
         return f"{self.area_editor.user.get_full_name()} → {self.journal.title}"
 
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import AreaEditor,AreaEditorJournalAssignment,AreaEditorRecommendation
+from .models import AreaEditor,AreaEditorJournalAssignment,AreaEditorRecommendation,EducationDetailOfAreaEditor
 from journal.models import SubjectArea, JournalSection
 from django.contrib.auth import authenticate
 from rest_framework.exceptions import AuthenticationFailed
+from django.db import transaction
+from journal.serializers import NestedJSONListSerializer
+from journal.sync import sync_child_rows, EDUCATION_MATCH_FIELDS, EDUCATION_UPDATE_FIELDS
 
 class AreaEditorRegistrationSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(write_only=True)
@@ -76,6 +79,14 @@ class LoginSerializer(serializers.Serializer):
         data['user'] = user
         return data
 
+class EducationDetailOfAreaEditorSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)  # optional, lets the client point at the row it edits
+
+    class Meta:
+        model = EducationDetailOfAreaEditor
+        fields = ['id', 'degree', 'field_of_study', 'institution', 'start_year', 'end_year', 'grade_or_score']
+        list_serializer_class = NestedJSONListSerializer
+
 class AreaEditorUpdateSerializer(serializers.ModelSerializer):
     subject_areas = serializers.PrimaryKeyRelatedField(
         many=True, queryset=SubjectArea.objects.all(), required=False
@@ -83,11 +94,25 @@ class AreaEditorUpdateSerializer(serializers.ModelSerializer):
     journal_sections = serializers.PrimaryKeyRelatedField(
         many=True, queryset=JournalSection.objects.all(), required=False
     )
+    educations = EducationDetailOfAreaEditorSerializer(many=True, required=False)
 
     class Meta:
         model = AreaEditor
         exclude = ['user', 'date_joined', 'number_of_assignments_handled']
 
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        educations_data = validated_data.pop('educations', None)
+        instance = super().update(instance, validated_data)
+
+        # Same diff based sync as the reviewer profile, only the rows that changed are written
+        if educations_data is not None:
+            sync_child_rows(
+                instance.educations.all(), EducationDetailOfAreaEditor, 'area_editor', instance, educations_data,
+                match_fields=EDUCATION_MATCH_FIELDS, update_fields=EDUCATION_UPDATE_FIELDS
+            )
+        return instance
+
 class AreaEditorListSerializer(serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
     email = serializers.EmailField(source='user.email')
@@ -141,7 +166,7 @@ class AreaEditorJournalAssignmentSerializer(serializers.ModelSerializer):
         model = AreaEditorJournalAssignment
         fields = [
             'id', 'journal', 'journal_title', 'area_editor',
-            'status', 'assigned_date', 'completed_date', 'notes'
+            'status', 'assigned_date', 'completed_date', 'due_date', 'notes'
         ]
         read_only_fields = ['id', 'status', 'assigned_date', 'completed_date', 'journal_title']
 
@@ -8,7 +8,8 @@ from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework import generics, permissions
 from .models import AreaEditor
-from django.core.mail import send_mail
+from django.db import transaction
+from journal.outbox import queue_email
 from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
@@ -156,7 +157,6 @@ class ApproveAreaEditorView(APIView): #end point to approve a particular area ed
         # Update the is_approved field
         serializer = AreaEditorApprovalSerializer(area_editor, data={'is_approved': True}, partial=True)
         if serializer.is_valid():
-            area_editor = serializer.save()
 
             # Send email to the Area Editor
             subject = "Congratulations! You are approved as an Area Editor"
@@ -165,13 +165,10 @@ class ApproveAreaEditorView(APIView): #end point to approve a particular area ed
                       "We are looking forward to your contributions.\n\nBest Regards,\nThe Editorial Team"
             recipient_email = area_editor.user.email
 
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,  # Sender email
-                [recipient_email],  # Recipient email
-                fail_silently=False,
-            )
+            # The approval and its email are committed together, the send_outbox worker delivers it
+            with transaction.atomic():
+                area_editor = serializer.save()
+                queue_email(subject, message, [recipient_email], settings.DEFAULT_FROM_EMAIL)
 
             return Response({"message": "Area Editor approved successfully and email sent."}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
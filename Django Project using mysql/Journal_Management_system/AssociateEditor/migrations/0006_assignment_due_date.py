@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:23
+
+import AssociateEditor.models
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_existing_due_dates(apps, schema_editor):
+    # Existing rows got the migration time as default, their deadline is counted from the assignment instead
+    AssociateEditorAssignment = apps.get_model('AssociateEditor', 'AssociateEditorAssignment')
+    AssociateEditorAssignment.objects.update(due_date=F('assigned_date') + timedelta(days=14))  # AssociateEditor.models.HANDLING_PERIOD at the time of writing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AssociateEditor', '0005_associateeditorrecommendation_overall_rating_and_more'),
+        ('journal', '0015_journalstatusrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='associateeditorassignment',
+            name='due_date',
+            field=models.DateTimeField(blank=True, default=AssociateEditor.models.get_handling_due_date, null=True),
+        ),
+        migrations.AddField(
+            model_name='associateeditorassignment',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_existing_due_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='associateeditorassignment',
+            index=models.Index(fields=['status', 'due_date'], name='aso_assignment_status_due_idx'),
+        ),
+    ]
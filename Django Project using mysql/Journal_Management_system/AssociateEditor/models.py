@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from journal.models import SubjectArea,Journal,JournalSection
 
@@ -36,7 +38,13 @@ class AssociateEditor(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.user.email})"
 
+HANDLING_PERIOD = timedelta(days=14)  # time an associate editor gets to handle a manuscript
+
+def get_handling_due_date():
+    return timezone.now() + HANDLING_PERIOD
+
 class AssociateEditorAssignment(models.Model):
+    OPEN_STATUSES = ['assigned', 'reviewing']  # statuses the overdue sweeper reminds about
     STATUS_CHOICES = [
         ('assigned', 'Assigned'),
         ('reviewing', 'Reviewing'),
@@ -47,8 +55,15 @@ class AssociateEditorAssignment(models.Model):
     associate_editor = models.ForeignKey(AssociateEditor, on_delete=models.CASCADE)
     assigned_date = models.DateTimeField(auto_now_add=True)
     completed_date = models.DateTimeField(null=True, blank=True)
+    due_date = models.DateTimeField(default=get_handling_due_date, null=True, blank=True)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)  # set by the overdue sweeper so every assignment is reminded once
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='assigned')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='aso_assignment_status_due_idx'),  # overdue sweeper range scans
+        ]
+
     def __str__(self):
         return f"{self.associate_editor.user.get_full_name()} → {self.journal.title}"
 
@@ -60,7 +60,7 @@ class AssociateEditorAssignmentSerializer(serializers.ModelSerializer):
         model = AssociateEditorAssignment
         fields = [
             'id', 'journal', 'associate_editor',
-            'assigned_date', 'completed_date', 'status'
+            'assigned_date', 'completed_date', 'due_date', 'status'
         ]
 
 class AssociateEditorRecommendationSerializer(serializers.ModelSerializer):
@@ -214,6 +214,7 @@ class AssociateEditorAssignmentListSerializer(serializers.ModelSerializer):
     subject_area = serializers.CharField(source='journal.subject_area.name')
     assigned_date = serializers.DateTimeField()
     completed_date = serializers.DateTimeField()
+    due_date = serializers.DateTimeField()
     status = serializers.CharField()
 
     class Meta:
@@ -228,6 +229,7 @@ class AssociateEditorAssignmentListSerializer(serializers.ModelSerializer):
             'subject_area',
             'assigned_date',
             'completed_date',
+            'due_date',
             'status',
         ]
 
@@ -1,7 +1,8 @@
 from rest_framework.generics import CreateAPIView
 from rest_framework.response import Response
 from rest_framework import status,permissions
-from django.core.mail import send_mail
+from django.db import transaction
+from journal.outbox import queue_email
 from django.conf import settings
 from .serializers import *
 from rest_framework.views import APIView
@@ -25,6 +26,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 class AssociateEditorRegistrationView(CreateAPIView): #end point to register a new associate editor
     serializer_class = AssociateEditorRegistrationSerializer
 
+    @transaction.atomic
     def perform_create(self, serializer):
         instance = serializer.save()
 
@@ -39,7 +41,7 @@ class AssociateEditorRegistrationView(CreateAPIView): #end point to register a n
         from_email = settings.DEFAULT_FROM_EMAIL
         recipient_list = [instance.user.email]
 
-        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
+        queue_email(subject, message, recipient_list, from_email)  # committed with the registration
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
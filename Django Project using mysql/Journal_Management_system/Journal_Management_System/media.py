@@ -0,0 +1,165 @@
+import mimetypes
+import os
+import re
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.utils._os import safe_join
+from django.utils.http import parse_etags, parse_http_date_safe
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+# Media folders that are not public, everything else (profile pictures, CVs, ...) is served to anyone
+MANUSCRIPT_DIRS = ('journals',)
+SUPPLEMENTARY_DIR = 'journals/supplementary/'  # listed by URL in Journal.supplementary_files instead of a FileField
+REVIEW_FILE_DIRS = ('review_feedback_files',)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def is_protected_media(path):
+    return path.split('/', 1)[0] in MANUSCRIPT_DIRS + REVIEW_FILE_DIRS
+
+def get_media_user(request): #the JWT can come from the Authorization header or from ?token= since iframes and download links can't send headers
+    if request.user.is_authenticated:
+        return request.user
+
+    authentication = JWTAuthentication()
+    try:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else request.GET.get('token')
+        if not raw_token:
+            return None
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, TokenError):
+        return None
+
+def is_editor(user): #staff and approved editors of every kind can open manuscripts under review
+    from AreaEditor.models import AreaEditor
+    from AssociateEditor.models import AssociateEditor
+    from Editor_Chief.models import EditorInChief
+
+    if user.is_staff:
+        return True
+    # Editors register themselves, only the accounts the editorial office approved count
+    return (
+        EditorInChief.objects.filter(user=user, is_approved=True).exists()
+        or AreaEditor.objects.filter(user=user, is_approved=True).exists()
+        or AssociateEditor.objects.filter(user=user, is_active=True).exists()
+    )
+
+def is_assigned_reviewer(user, journals): #an approved reviewer sees a manuscript only while assigned to it or after reviewing it
+    from reviewer.models import ReviewerAssignmentHistory
+
+    return ReviewerAssignmentHistory.objects.filter(
+        journal__in=journals, reviewer__user=user, reviewer__is_approved=True, status__in=ReviewerAssignmentHistory.ACTIVE_STATUSES
+    ).exists()
+
+def can_access_media(request, path): #access check for the manuscripts and review files, returns True for the public folders
+    from journal.models import Journal
+    from reviewer.models import ReviewFeedback
+
+    folder = path.split('/', 1)[0]
+
+    if folder in MANUSCRIPT_DIRS:
+        # Identical uploads share one stored file, so every journal pointing at the path counts
+        if path.startswith(SUPPLEMENTARY_DIR):
+            url = default_storage.url(path)  # attach_upload stores the storage URL
+            candidates = Journal.objects.filter(supplementary_files__icontains=url).only('id', 'supplementary_files')
+            journals = Journal.objects.filter(id__in=[
+                journal.id for journal in candidates
+                if isinstance(journal.supplementary_files, list) and url in journal.supplementary_files
+            ])
+        else:
+            journals = Journal.objects.filter(manuscript_file=path)
+        if journals.filter(status='accepted').exists():
+            return True  # accepted manuscripts are published on the public site
+
+        user = get_media_user(request)
+        if user is None:
+            return False
+        if journals.filter(corresponding_author__user=user).exists() or journals.filter(co_authors__user=user).exists():
+            return True
+        return is_editor(user) or is_assigned_reviewer(user, journals)
+
+    if folder in REVIEW_FILE_DIRS:
+        user = get_media_user(request)
+        if user is None:
+            return False
+        if ReviewFeedback.objects.filter(file_upload=path, reviewer__user=user).exists():
+            return True
+        return is_editor(user)  # other reviewers must not see each other's reviews
+
+    return True
+
+def get_file_etag(stat):
+    return '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+
+def is_not_modified(request, etag, mtime): #If-None-Match wins over If-Modified-Since like in django.utils.cache
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+def parse_range(request, size, etag, mtime): #returns (start, end) for a single satisfiable byte range, None for a full response and False when unsatisfiable
+    header = request.META.get('HTTP_RANGE', '').strip()
+    if not header:
+        return None
+
+    # If-Range: only honour the range when the client's copy is still current
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if if_range:
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            if if_range != etag:
+                return None
+        else:
+            if_range_date = parse_http_date_safe(if_range)
+            if if_range_date is None or int(mtime) > if_range_date:
+                return None
+
+    match = RANGE_RE.match(header)
+    if not match:
+        return None  # multiple or malformed ranges, the whole file is sent instead
+    first, last = match.groups()
+
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        start, end = max(size - int(last), 0), size - 1  # suffix range: the last N bytes
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size or start > end:
+        return False
+    return start, end
+
+def read_file_range(full_path, start, end): #streams the byte range without loading it into memory
+    with open(full_path, 'rb') as media_file:
+        media_file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = media_file.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def get_content_type(full_path):
+    content_type, encoding = mimetypes.guess_type(full_path)
+    return content_type or 'application/octet-stream'
+
+def get_sendfile_mode():
+    return getattr(settings, 'MEDIA_SENDFILE_MODE', 'django')
+
+def get_accel_redirect_path(path): #internal nginx location that maps to MEDIA_ROOT
+    return getattr(settings, 'MEDIA_SENDFILE_ROOT', '/protected-media/').rstrip('/') + '/' + path
+
+def get_full_media_path(path): #None when the path escapes MEDIA_ROOT or is not a file
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        return None
+    return full_path if os.path.isfile(full_path) else None
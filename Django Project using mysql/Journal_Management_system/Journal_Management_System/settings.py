@@ -28,6 +28,24 @@ if env_path.exists():
                 os.environ[key] = value
 
 MEDIA_URL = '/media/'
+
+# How serve_media hands files out: 'django' streams them from the worker, 'x-sendfile' (apache mod_xsendfile)
+# or 'x-accel-redirect' (nginx, with an internal location at MEDIA_SENDFILE_ROOT aliased to MEDIA_ROOT) offload to the web server
+MEDIA_SENDFILE_MODE = os.environ.get('MEDIA_SENDFILE_MODE', 'django')
+MEDIA_SENDFILE_ROOT = '/protected-media/'
+
+# Uploads are stored once per folder under their sha256 (Journal_Management_System/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'Journal_Management_System.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Part files of the resumable uploads, kept outside MEDIA_ROOT so they are never served
+CHUNKED_UPLOAD_DIR = os.path.join(BASE_DIR, 'chunked_uploads')
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -126,6 +144,26 @@ DATABASES = {
     }
 }
 
+# Cache of the lookup tables, the review summaries and the change logs that keep the in-memory reviewer indexes
+# (matching, conflicts of interest) of all workers in step. Set REDIS_URL to share it between worker processes,
+# without it every process keeps its own LocMemCache which is enough for a single worker (eg. runserver)
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'journal-management-system',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'journal-management-system',
+        }
+    }
+
 # for email sending
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -0,0 +1,71 @@
+import hashlib
+import os
+import posixpath
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.db import transaction
+from django.db.models import F
+
+MAX_EXTENSION_LENGTH = 8  # keeps the longest upload_to + sharded hash name within the default FileField max_length of 100
+
+def get_content_hash(content): #sha256 of an uploaded file read chunk by chunk
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+def get_hashed_name(name, sha256): #journals/Abstract_1.pdf -> journals/ab/cd/<rest of the hash>.pdf
+    folder = posixpath.dirname(name)
+    extension = os.path.splitext(name)[1].lower()
+    if len(extension) > MAX_EXTENSION_LENGTH:
+        extension = ''
+    return posixpath.join(folder, sha256[:2], sha256[2:4], sha256[4:] + extension)
+
+class ContentAddressedStorage(FileSystemStorage): #stores every upload once per folder under its sha256, sharded in two directory levels, with a reference count per stored file
+    def save(self, name, content, max_length=None):
+        from journal.models import StoredFile
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        validate_file_name(name, allow_relative_path=True)
+        sha256 = get_content_hash(content)
+        hashed_name = get_hashed_name(name, sha256)
+
+        with transaction.atomic():
+            updated = StoredFile.objects.filter(name=hashed_name).update(ref_count=F('ref_count') + 1)
+            if updated and self.exists(hashed_name):
+                return hashed_name  # identical file already stored, nothing is written
+
+            if not self.exists(hashed_name):
+                hashed_name = self._save(hashed_name, content)
+            if not updated:
+                stored, created = StoredFile.objects.get_or_create(
+                    name=hashed_name,
+                    defaults={'sha256': sha256, 'size': content.size, 'ref_count': 1}
+                )
+                if not created:  # another request stored the same file meanwhile
+                    StoredFile.objects.filter(id=stored.id).update(ref_count=F('ref_count') + 1)
+
+        return hashed_name.replace('\\', '/')
+
+    def delete(self, name): #drops one reference, the file itself goes away with the last one
+        from journal.models import StoredFile
+
+        if not name:
+            return
+
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is not None and stored.ref_count > 1:
+                StoredFile.objects.filter(id=stored.id).update(ref_count=F('ref_count') - 1)
+                return
+            if stored is not None:
+                stored.delete()
+
+        super().delete(name)
@@ -15,9 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path,include
+from django.urls import path,include,re_path
 from . import views
-from django.conf.urls.static import static
 from django.conf import settings
 
 urlpatterns = [
@@ -28,5 +27,6 @@ urlpatterns = [
     path('reviewer/',include('reviewer.urls')), #include reviewer app URLS
     path('associate-editor/',include('AssociateEditor.urls')), #include AssociateEditor app URLS
     path('area-editor/',include('AreaEditor.urls')), #include AssociateEditor app URLS
-    path('editor-chief/',include('Editor_Chief.urls'))
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('editor-chief/',include('Editor_Chief.urls')),
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), views.serve_media, name='media'), #serves the uploaded files with Range support and access checks on manuscripts and review files
+]
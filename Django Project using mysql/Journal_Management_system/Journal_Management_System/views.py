@@ -1,5 +1,61 @@
-from django.http import HttpResponse
+import os
+from urllib.parse import quote
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse, Http404
 from django.shortcuts import render
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from .media import (
+    can_access_media, get_full_media_path, get_file_etag, is_not_modified, parse_range,
+    read_file_range, get_content_type, get_sendfile_mode, get_accel_redirect_path, is_protected_media
+)
 
 def home(request):
-    return HttpResponse("Hello from the backend side of the journal management system!")
\ No newline at end of file
+    return HttpResponse("Hello from the backend side of the journal management system!")
+
+@require_safe
+def serve_media(request, path): #serves MEDIA_ROOT with Range / If-Range, ETag / Last-Modified and optional X-Sendfile / X-Accel-Redirect offload
+    full_path = get_full_media_path(path)
+    if full_path is None:
+        raise Http404("File not found.")
+
+    if not can_access_media(request, path):
+        return HttpResponse("You do not have access to this file.", status=403)
+
+    stat = os.stat(full_path)
+    etag = get_file_etag(stat)
+    content_type = get_content_type(full_path)
+
+    if is_not_modified(request, etag, stat.st_mtime):
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        return response
+
+    mode = get_sendfile_mode()
+    if mode in ('x-accel-redirect', 'x-sendfile'):
+        # The web server streams the file and handles Range itself, the worker is released right away
+        response = HttpResponse(content_type=content_type)
+        if mode == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = quote(get_accel_redirect_path(path))
+        else:
+            response['X-Sendfile'] = full_path
+    else:
+        byte_range = parse_range(request, stat.st_size, etag, stat.st_mtime)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+        if byte_range is None:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(read_file_range(full_path, start, end), status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = 'private, no-cache' if is_protected_media(path) else 'public, max-age=86400'
+    return response
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CACHE_TIMEOUT = 60 * 60  # the lookup tables almost never change, writes bump the version anyway
+
+def _version_key(name):
+    return f'journal:lookup:{name}:version'
+
+def get_lookup_version(name):
+    version = cache.get(_version_key(name))
+    if version is None:
+        cache.add(_version_key(name), 1, timeout=None)
+        version = cache.get(_version_key(name), 1)
+    return version
+
+def bump_lookup_version(name): #invalidates every cached copy of the lookup table by moving to a new version key
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), 2, timeout=None)
+
+def get_cached_lookup(name, build): #returns {'data': ..., 'etag': ...} for the lookup table, build() is only called on a cache miss
+    key = f'journal:lookup:{name}:v{get_lookup_version(name)}'
+    cached = cache.get(key)
+    if cached is None:
+        data = list(build())
+        body = json.dumps(data, sort_keys=True, default=str).encode()
+        cached = {'data': data, 'etag': '"%s"' % hashlib.sha256(body).hexdigest()}
+        cache.set(key, cached, timeout=LOOKUP_CACHE_TIMEOUT)
+    return cached
+
+CHANGE_LOG_TIMEOUT = 24 * 60 * 60  # a process that falls further behind than this rebuilds its index from scratch
+MAX_REPLAYED_CHANGES = 500  # beyond this many pending changes a rebuild is cheaper than replaying them
+
+class ChangeLog: #per-entity change feed in the shared cache, lets in-memory indexes of other processes reload only what changed
+    def __init__(self, name):
+        self.name = name
+
+    def _seq_key(self):
+        return f'journal:changes:{self.name}:seq'
+
+    def _entry_key(self, seq):
+        return f'journal:changes:{self.name}:{seq}'
+
+    def current(self):
+        seq = cache.get(self._seq_key())
+        if seq is None:
+            # Starting from the clock instead of 0 means a flushed cache never replays numbers a process has already seen,
+            # the jump is larger than MAX_REPLAYED_CHANGES so every process rebuilds
+            cache.add(self._seq_key(), int(time.time() * 1000) * 1000, timeout=None)
+            seq = cache.get(self._seq_key(), 0)
+        return seq
+
+    def reset(self): #drops the counter, the next reader starts from the clock again and every process rebuilds
+        try:
+            cache.delete(self._seq_key())
+        except Exception:
+            logger.exception("Could not reset the %s change log", self.name)
+
+    def _append(self, entities): #returns False when the cache failed, the change is then only known to this process
+        try:
+            for entity in entities:
+                self.current()
+                seq = cache.incr(self._seq_key())
+                cache.set(self._entry_key(seq), entity, timeout=CHANGE_LOG_TIMEOUT)
+        except Exception:
+            # A cache outage must not fail the save that triggered it, the indexes are rebuilt instead
+            logger.exception("Could not record changes in the %s change log, the indexes will be rebuilt", self.name)
+            self.reset()
+            return False
+        return True
+
+    def record(self, *entities): #appends the changed entities, again after the commit so nobody reloads them before the new rows are visible
+        entities = list(entities)
+        recorded = self._append(entities)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._append(entities))
+        return recorded
+
+    def since(self, seen): #returns (current seq, set of entities changed after seen), the set is None when the log can't tell
+        try:
+            current = self.current()
+            if seen is None or current < seen or current - seen > MAX_REPLAYED_CHANGES:
+                return current, None
+            if current == seen:
+                return current, set()
+            keys = [self._entry_key(seq) for seq in range(seen + 1, current + 1)]
+            entries = cache.get_many(keys)
+        except Exception:
+            logger.exception("Could not read the %s change log, the index is rebuilt", self.name)
+            return None, None
+        if len(entries) != len(keys):
+            return current, None  # expired, or a writer incremented the counter and hasn't stored its entry yet
+        return current, set(entries.values())
+
+class SharedIndex: #base of the in-process indexes (reviewer vectors, conflicts) kept in step with the other processes through a ChangeLog
+    change_log_name = None
+
+    def __init__(self):
+        self.changes = ChangeLog(self.change_log_name)
+        self.lock = threading.RLock()
+        self.built = False
+        self.seen = None
+
+    def load_all(self): #subclasses read every row they index
+        raise NotImplementedError
+
+    def refresh(self, entities): #subclasses reload the given entities from the database
+        raise NotImplementedError
+
+    def notify(self, *entities): #called by the model signals, every process applies the change on its next use
+        if not self.changes.record(*entities):
+            with self.lock:
+                self.built = False  # this process can't rely on the log either
+
+    def ensure_current(self):
+        with self.lock:
+            current, entities = self.changes.since(self.seen)
+            if not self.built or entities is None:
+                self.load_all()
+                self.built = True
+            elif entities:
+                self.refresh(entities)
+            self.seen = current  # read before loading, a change arriving meanwhile is simply replayed next time
@@ -0,0 +1,68 @@
+import csv
+import json
+from datetime import date, datetime
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+class Echo: #file-like object for csv.writer that hands every line back instead of buffering it
+    def write(self, value):
+        return value
+
+def iterate_rows(queryset, lookups, chunk_size=EXPORT_CHUNK_SIZE): #yields values_list rows in primary key order, one keyset query per chunk
+    # MySQL drivers buffer a whole result set even with iterator(), so the rows are read chunk by chunk with id > last id
+    rows = queryset.order_by('pk').values_list('pk', *lookups)
+    last_pk = None
+    while True:
+        chunk = list((rows.filter(pk__gt=last_pk) if last_pk is not None else rows)[:chunk_size])
+        for row in chunk:
+            yield row[1:]
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1][0]
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def csv_cell(value): #cells starting like a formula are prefixed so spreadsheets show them as text
+    value = format_value(value)
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def stream_csv(headers, rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM so Excel opens the UTF-8 file correctly
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+def stream_ndjson(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, map(format_value, row))), default=str) + '\n'
+
+def export_response(queryset, columns, export_format, filename): #streams the queryset as CSV or NDJSON, columns are (header, lookup) pairs
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise NotFound(f"Unknown export format, use one of: {', '.join(EXPORT_CONTENT_TYPES)}.")
+
+    headers = [header for header, lookup in columns]
+    rows = iterate_rows(queryset, [lookup for header, lookup in columns])
+    stream = stream_csv(headers, rows) if export_format == 'csv' else stream_ndjson(headers, rows)
+
+    response = StreamingHttpResponse(stream, content_type=EXPORT_CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{timezone.localdate():%Y%m%d}.{export_format}"'
+    response['X-Accel-Buffering'] = 'no'  # let nginx pass the rows through as they are produced
+    return response
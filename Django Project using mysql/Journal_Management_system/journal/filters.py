@@ -0,0 +1,67 @@
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from .models import Journal
+
+JOURNAL_STATUSES = [choice[0] for choice in Journal.STATUS_CHOICES]
+
+def get_multi_values(query_params, key): #reads a multi-value query param given either repeated (?status=a&status=b) or comma-separated (?status=a,b)
+    values = []
+    for raw in query_params.getlist(key):
+        values += [value.strip() for value in raw.split(',') if value.strip()]
+    return values
+
+def get_id_values(query_params, key): #same as get_multi_values but every value has to be an integer id
+    try:
+        return [int(value) for value in get_multi_values(query_params, key)]
+    except ValueError:
+        raise ValidationError({key: "Expected a list of integer ids."})
+
+def parse_date_param(query_params, key, end_of_day=False): #accepts either a date (2025-05-01) or a full datetime and always returns an aware datetime
+    raw = query_params.get(key)
+    if not raw:
+        return None
+
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError({key: "Expected a date (YYYY-MM-DD) or an ISO datetime."})
+        # A plain date covers the whole day; comparing on the raw column keeps the range index-friendly
+        value = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+def filter_journals(journals, query_params, include_status=True): #applies the status / subject_area / journal_section / author / date range filters of the journal list end points
+    statuses = get_multi_values(query_params, 'status')
+    invalid = [value for value in statuses if value not in JOURNAL_STATUSES]
+    if invalid:
+        raise ValidationError({'status': f"Unknown status: {', '.join(invalid)}."})
+
+    if include_status and statuses:
+        journals = journals.filter(status__in=statuses)
+
+    subject_areas = get_id_values(query_params, 'subject_area')
+    if subject_areas:
+        journals = journals.filter(subject_area_id__in=subject_areas)
+
+    journal_sections = get_id_values(query_params, 'journal_section')
+    if journal_sections:
+        journals = journals.filter(journal_section_id__in=journal_sections)
+
+    authors = get_id_values(query_params, 'author')
+    if authors:
+        journals = journals.filter(corresponding_author_id__in=authors)
+
+    submitted_from = parse_date_param(query_params, 'submitted_from')
+    if submitted_from:
+        journals = journals.filter(submission_date__gte=submitted_from)
+
+    submitted_to = parse_date_param(query_params, 'submitted_to', end_of_day=True)
+    if submitted_to:
+        journals = journals.filter(submission_date__lt=submitted_to)
+
+    return journals
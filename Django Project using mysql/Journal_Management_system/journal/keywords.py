@@ -0,0 +1,30 @@
+import re
+from .models import Keyword, JournalKeyword
+
+KEYWORD_MAX_LENGTH = Keyword._meta.get_field('name').max_length
+
+def normalize_keyword(raw):
+    return re.sub(r'\s+', ' ', (raw or '').strip().lower())[:KEYWORD_MAX_LENGTH]
+
+def parse_keywords(raw): #splits the comma-separated Journal.keywords text into unique normalized keywords, keeping their order
+    keywords = [normalize_keyword(part) for part in (raw or '').split(',')]
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+def sync_journal_keywords(journal): #brings the JournalKeyword links of a journal in line with its keywords text
+    names = parse_keywords(journal.keywords)
+
+    if names:
+        Keyword.objects.bulk_create([Keyword(name=name) for name in names], ignore_conflicts=True)
+    keyword_ids = set(Keyword.objects.filter(name__in=names).values_list('id', flat=True)) if names else set()
+
+    existing = set(JournalKeyword.objects.filter(journal=journal).values_list('keyword_id', flat=True))
+    stale = existing - keyword_ids
+    if stale:
+        JournalKeyword.objects.filter(journal=journal, keyword_id__in=stale).delete()
+
+    missing = keyword_ids - existing
+    if missing:
+        JournalKeyword.objects.bulk_create(
+            [JournalKeyword(journal=journal, keyword_id=keyword_id) for keyword_id in missing],
+            ignore_conflicts=True
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from journal.models import Journal
+from journal.keywords import sync_journal_keywords
+
+class Command(BaseCommand):
+    help = "Parse Journal.keywords of the existing journals into the normalized Keyword / JournalKeyword tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        journals = Journal.objects.only('id', 'keywords').order_by('id').iterator(chunk_size=options['chunk_size'])
+
+        count = 0
+        for journal in journals:
+            sync_journal_keywords(journal)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Keywords indexed for {count} journals."))
@@ -0,0 +1,59 @@
+import os
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import FileField
+from Journal_Management_System.storage import ContentAddressedStorage
+from journal.models import StoredFile
+
+class Command(BaseCommand):
+    help = "Move the existing uploads into the content addressed storage, deduplicating identical files and updating every FileField/ImageField row"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be moved")
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            self.stderr.write("The default storage is not ContentAddressedStorage, check STORAGES in settings.")
+            return
+
+        moved = skipped = missing = 0
+        old_paths = set()
+
+        for model in apps.get_models():
+            file_fields = [field for field in model._meta.concrete_fields if isinstance(field, FileField)]
+            for field in file_fields:
+                rows = model.objects.exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+                for pk, name in rows.values_list('pk', field.attname).iterator(chunk_size=500):
+                    if StoredFile.objects.filter(name=name).exists():
+                        skipped += 1  # already content addressed
+                        continue
+
+                    old_path = default_storage.path(name)
+                    if not os.path.isfile(old_path):
+                        missing += 1
+                        self.stderr.write(f"Missing file for {model.__name__}.{field.name} #{pk}: {name}")
+                        continue
+
+                    if options['dry_run']:
+                        self.stdout.write(f"{model.__name__}.{field.name} #{pk}: {name}")
+                        moved += 1
+                        continue
+
+                    with open(old_path, 'rb') as old_file:
+                        new_name = default_storage.save(name, File(old_file, name=os.path.basename(name)))
+                    model.objects.filter(pk=pk).update(**{field.attname: new_name})
+                    old_paths.add(old_path)
+                    moved += 1
+
+        # The originals are removed only once every row pointing at them was moved
+        for old_path in old_paths:
+            if os.path.isfile(old_path):
+                os.remove(old_path)
+
+        action = "Would move" if options['dry_run'] else "Moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {moved} files, {skipped} already stored, {missing} missing. "
+            f"{StoredFile.objects.count()} distinct files stored."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from journal.models import DeletionOTP
+
+class Command(BaseCommand):
+    help = "Delete deletion OTPs that expired or were already used, meant to run periodically from cron"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # Rows past the validity window are useless, and the rate limit only looks at the same window
+        cutoff = timezone.now() - DeletionOTP.VALIDITY
+        total = 0
+        while True:
+            # Deleting by id in batches keeps every DELETE short on a large table
+            ids = list(DeletionOTP.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            deleted, _ = DeletionOTP.objects.filter(id__in=ids).delete()
+            total += deleted
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {total} expired OTPs."))
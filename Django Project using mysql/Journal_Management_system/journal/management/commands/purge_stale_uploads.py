@@ -0,0 +1,24 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from journal.models import ChunkedUpload
+from journal.uploads import discard_upload
+
+class Command(BaseCommand):
+    help = "Delete resumable uploads (and their part files) that were not touched for a while"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help="Uploads idle for longer than this are dropped")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ChunkedUpload.objects.filter(status='uploading', updated_at__lt=cutoff)
+
+        count = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            count += 1
+
+        # Completed uploads have no part file left, only the row
+        completed, _ = ChunkedUpload.objects.filter(status='complete', updated_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} stale and {completed} completed uploads."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from journal.rollup import rebuild_rollup
+
+class Command(BaseCommand):
+    help = "Recompute the journal status rollup used by /journal/stats/ from the journal table"
+
+    def handle(self, *args, **options):
+        # Needed after bulk imports or raw SQL edits that bypass the model signals and transitions.py
+        groups = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the status rollup, {groups} groups."))
@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from journal.outbox import send_pending_emails
+
+class Command(BaseCommand):
+    help = "Send the queued emails of the outbox, batching them over one SMTP connection and retrying failures with backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting once it is drained")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to wait between polls in --loop mode")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending_emails(batch_size=options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            if sent + failed == options['batch_size']:
+                continue  # more is probably waiting
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Outbox drained: {total_sent} sent, {total_failed} failed."))
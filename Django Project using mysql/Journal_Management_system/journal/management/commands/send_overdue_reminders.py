@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from journal.reminders import REMINDER_BATCH_SIZE, send_overdue_reminders
+from reviewer.models import ReviewerAssignmentHistory
+from AreaEditor.models import AreaEditorJournalAssignment
+from AssociateEditor.models import AssociateEditorAssignment
+
+# (label, model, assignee field, role named in the email)
+ASSIGNMENT_TYPES = [
+    ('reviewer', ReviewerAssignmentHistory, 'reviewer', 'review'),
+    ('area editor', AreaEditorJournalAssignment, 'area_editor', 'area editor'),
+    ('associate editor', AssociateEditorAssignment, 'associate_editor', 'associate editor'),
+]
+
+class Command(BaseCommand):
+    help = "Queue a reminder email for every open reviewer and editor assignment past its due date, meant to run periodically from cron"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        # The emails only go out through send_outbox, so a failing SMTP server never blocks the sweep
+        for label, model, assignee_field, role in ASSIGNMENT_TYPES:
+            queued = send_overdue_reminders(model, assignee_field, role, batch_size=options['batch_size'])
+            self.stdout.write(f"{label}: {queued} reminders queued.")
+        self.stdout.write(self.style.SUCCESS("Overdue sweep finished."))
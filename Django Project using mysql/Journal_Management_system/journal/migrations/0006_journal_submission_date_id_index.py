@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('author', '0001_initial'),
+        ('journal', '0005_alter_journal_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['submission_date', 'id'], name='journal_submitted_id_idx'),
+        ),
+    ]
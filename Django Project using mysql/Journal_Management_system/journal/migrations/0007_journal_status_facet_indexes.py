@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('author', '0001_initial'),
+        ('journal', '0006_journal_submission_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['status', 'submission_date'], name='journal_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['subject_area', 'status'], name='journal_subject_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['journal_section', 'status'], name='journal_section_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['corresponding_author', 'status'], name='journal_author_status_idx'),
+        ),
+    ]
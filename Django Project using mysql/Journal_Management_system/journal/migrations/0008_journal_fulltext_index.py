@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def add_fulltext_index(apps, schema_editor):
+    # Only MySQL has FULLTEXT, other backends fall back to journal.search.InvertedIndex
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE journal_journal ADD FULLTEXT INDEX journal_fulltext_idx (title, abstract, keywords)'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('ALTER TABLE journal_journal DROP INDEX journal_fulltext_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0007_journal_status_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0008_journal_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JournalKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('journal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_links', to='journal.journal')),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='journal_links', to='journal.keyword')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['keyword', 'journal'], name='keyword_journal_idx')],
+                'constraints': [models.UniqueConstraint(fields=('journal', 'keyword'), name='unique_journal_keyword')],
+            },
+        ),
+    ]
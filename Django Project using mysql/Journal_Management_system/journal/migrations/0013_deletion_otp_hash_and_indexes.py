@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:02
+
+import hashlib
+import hmac
+from django.conf import settings
+from django.db import migrations, models
+
+
+def hash_existing_otps(apps, schema_editor):
+    # Same keyed hash as journal.utils.hash_otp, copied so the migration doesn't depend on app code
+    def hash_otp(journal_id, otp):
+        return hmac.new(settings.SECRET_KEY.encode(), f"{journal_id}:{otp}".encode(), hashlib.sha256).hexdigest()
+
+    DeletionOTP = apps.get_model('journal', 'DeletionOTP')
+    for otp in DeletionOTP.objects.all().iterator():
+        otp.otp_hash = hash_otp(otp.journal_id, otp.otp)
+        otp.save(update_fields=['otp_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0012_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletionotp',
+            name='otp_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(hash_existing_otps, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='deletionotp',
+            name='otp',
+        ),
+        migrations.AddField(
+            model_name='deletionotp',
+            name='used_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='deletionotp',
+            index=models.Index(fields=['journal_id', 'author', 'otp_hash'], name='deletion_otp_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletionotp',
+            index=models.Index(fields=['author', 'created_at'], name='deletion_otp_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletionotp',
+            index=models.Index(fields=['created_at'], name='deletion_otp_created_idx'),
+        ),
+    ]
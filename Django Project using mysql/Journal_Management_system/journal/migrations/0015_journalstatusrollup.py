@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:14
+
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_rollup(apps, schema_editor):
+    Journal = apps.get_model('journal', 'Journal')
+    JournalStatusRollup = apps.get_model('journal', 'JournalStatusRollup')
+    groups = (
+        Journal.objects
+        .annotate(area=Coalesce('subject_area_id', Value(0)), section=Coalesce('journal_section_id', Value(0)))
+        .values('status', 'area', 'section')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    JournalStatusRollup.objects.bulk_create([
+        JournalStatusRollup(status=group['status'], subject_area_id=group['area'], journal_section_id=group['section'], count=group['total'])
+        for group in groups
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0014_journalstatusevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('revisions_required', 'Revisions Required'), ('accepted', 'Accepted'), ('rejected', 'Rejected'), ('review_done', 'Review Done')], max_length=50)),
+                ('subject_area_id', models.IntegerField(default=0)),
+                ('journal_section_id', models.IntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('status', 'subject_area_id', 'journal_section_id'), name='unique_status_rollup')],
+            },
+        ),
+        migrations.RunPython(fill_rollup, migrations.RunPython.noop),
+    ]
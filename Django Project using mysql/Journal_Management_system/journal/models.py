@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from author.models import Author  # Import Author model from the correct app
 from django.utils import timezone
 from datetime import timedelta
+import uuid
 
 class SubjectArea(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -40,16 +41,158 @@ class Journal(models.Model):
     submission_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='submitted')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['submission_date', 'id'], name='journal_submitted_id_idx'),  # keyset pagination of the journal lists
+            models.Index(fields=['status', 'submission_date'], name='journal_status_submitted_idx'),  # status filtered lists and the status facet
+            models.Index(fields=['subject_area', 'status'], name='journal_subject_status_idx'),
+            models.Index(fields=['journal_section', 'status'], name='journal_section_status_idx'),
+            models.Index(fields=['corresponding_author', 'status'], name='journal_author_status_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+class JournalStatusEvent(models.Model): #append-only log of journal status transitions
+    journal = models.ForeignKey(Journal, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=50, choices=Journal.STATUS_CHOICES)
+    to_status = models.CharField(max_length=50, choices=Journal.STATUS_CHOICES)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['journal', 'created_at'], name='status_event_journal_idx'),  # history of one journal
+            models.Index(fields=['to_status', 'created_at'], name='status_event_to_status_idx'),  # e.g. everything accepted this month
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Journal status events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.journal_id}: {self.from_status} → {self.to_status}"
+
+class JournalStatusRollup(models.Model): #journal count per (status, subject area, section), kept current on every write so the stats never scan the journal table
+    status = models.CharField(max_length=50, choices=Journal.STATUS_CHOICES)
+    subject_area_id = models.IntegerField(default=0)  # 0 when the journal has no subject area, a NULL would break the unique constraint on MySQL
+    journal_section_id = models.IntegerField(default=0)  # 0 when the journal has no section
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'subject_area_id', 'journal_section_id'], name='unique_status_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.status} / {self.subject_area_id} / {self.journal_section_id}: {self.count}"
+
+class Keyword(models.Model): #normalized keyword parsed out of Journal.keywords
+    name = models.CharField(max_length=100, unique=True)  # lower-cased, the unique index also serves prefix lookups
+
+    def __str__(self):
+        return self.name
+
+class JournalKeyword(models.Model): #link between a journal and its keywords
+    journal = models.ForeignKey(Journal, on_delete=models.CASCADE, related_name='keyword_links')
+    keyword = models.ForeignKey(Keyword, on_delete=models.CASCADE, related_name='journal_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['journal', 'keyword'], name='unique_journal_keyword'),
+        ]
+        indexes = [
+            models.Index(fields=['keyword', 'journal'], name='keyword_journal_idx'),  # keyword -> journals lookups and the keyword facet
+        ]
+
+    def __str__(self):
+        return f"{self.keyword.name} → {self.journal.title}"
+
+
+class DeletionOTP(models.Model): #single use OTP, only a keyed hash of the code is stored
+    VALIDITY = timedelta(minutes=10)
 
-class DeletionOTP(models.Model):
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
     journal_id = models.IntegerField()
-    otp = models.CharField(max_length=6)
+    otp_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
+    used_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Confirmation looks the code up by these three columns
+            models.Index(fields=['journal_id', 'author', 'otp_hash'], name='deletion_otp_lookup_idx'),
+            # Rate limiting counts an author's recent requests
+            models.Index(fields=['author', 'created_at'], name='deletion_otp_author_idx'),
+            # Purge of expired rows
+            models.Index(fields=['created_at'], name='deletion_otp_created_idx'),
+        ]
 
     def is_valid(self):
-        return timezone.now() < self.created_at + timedelta(minutes=10)
+        return self.used_at is None and timezone.now() < self.created_at + self.VALIDITY
+
+class ChunkedUpload(models.Model): #resumable upload of a manuscript or supplementary file, chunks are appended to a part file on disk
+    TARGET_CHOICES = [
+        ('manuscript', 'Manuscript'),
+        ('supplementary', 'Supplementary File'),
+    ]
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)  # number of bytes received so far
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES, default='manuscript')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='chunked_upload_stale_idx'),  # purge of abandoned uploads
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+class StoredFile(models.Model): #reference count of a file kept by the content addressed storage, shared by every FileField/ImageField row pointing at it
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} references)"
+
+class OutboxEmail(models.Model): #email queued in the same transaction as the change that triggers it, sent later by the send_outbox command
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True, null=True)
+    recipients = models.JSONField(help_text="List of recipient email addresses")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),  # the worker only reads due pending rows
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)} ({self.status})"
 
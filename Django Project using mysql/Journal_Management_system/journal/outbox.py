@@ -0,0 +1,77 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxEmail
+
+MAX_ATTEMPTS = 6
+BASE_RETRY_DELAY = 60  # seconds, doubled after every failed attempt
+
+def queue_email(subject, message, recipient_list, from_email=None): #replacement for send_mail, the row commits or rolls back together with the caller's transaction
+    return OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+def queue_emails(emails): #bulk version of queue_email for (subject, message, recipient_list) tuples
+    return OutboxEmail.objects.bulk_create([
+        OutboxEmail(subject=subject, message=message, from_email=settings.DEFAULT_FROM_EMAIL, recipients=list(recipient_list))
+        for subject, message, recipient_list in emails
+    ])
+
+def get_retry_delay(attempts):
+    return timedelta(seconds=BASE_RETRY_DELAY * 2 ** (attempts - 1))
+
+def record_failure(email, error, now): #gives up after MAX_ATTEMPTS, else schedules the next try with exponential backoff
+    email.last_error = str(error)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = 'failed'
+    else:
+        email.next_attempt_at = now + get_retry_delay(email.attempts)
+
+def send_pending_emails(batch_size=50): #sends one batch of due emails over a single SMTP connection, returns (sent, failed)
+    now = timezone.now()
+
+    with transaction.atomic():
+        # skip_locked lets several workers drain the outbox without sending a message twice
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+
+        sent = failed = 0
+        connection = get_connection(fail_silently=False)
+        try:
+            try:
+                connection.open()
+            except Exception as e:
+                # The connection itself could not be opened, every email of the batch used up an attempt
+                for email in batch:
+                    email.attempts += 1
+                    record_failure(email, e, now)
+                failed = len(batch)
+            else:
+                for email in batch:
+                    email.attempts += 1
+                    try:
+                        EmailMessage(email.subject, email.message, email.from_email, email.recipients, connection=connection).send()
+                    except Exception as e:
+                        failed += 1
+                        record_failure(email, e, now)
+                    else:
+                        sent += 1
+                        email.status = 'sent'
+                        email.sent_at = timezone.now()
+                        email.last_error = None
+        finally:
+            connection.close()
+
+        OutboxEmail.objects.bulk_update(batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+    return sent, failed
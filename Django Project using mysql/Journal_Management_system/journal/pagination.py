@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+class JournalCursorPagination(CursorPagination): #keyset (cursor) pagination for the journal list end points ordered on (submission_date, id)
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-submission_date', '-id')  # backed by the journal_submitted_id_idx composite index
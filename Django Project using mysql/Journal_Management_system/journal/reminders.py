@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .outbox import queue_emails
+
+REMINDER_BATCH_SIZE = 200
+
+def get_overdue_batch(model, assignee_field, assignment_status, now, after, batch_size): #next batch of one status in (due_date, id) order, read through the (status, due_date) index
+    rows = model.objects.filter(status=assignment_status, due_date__lt=now, reminder_sent_at__isnull=True)
+    if after is not None:
+        rows = rows.filter(Q(due_date__gt=after[0]) | Q(due_date=after[0], id__gt=after[1]))
+    return list(
+        # skip_locked lets two sweeper runs overlap without reminding anyone twice
+        rows.select_for_update(skip_locked=True, of=('self',))
+        .order_by('due_date', 'id')
+        .values('id', 'due_date', 'journal__title', f'{assignee_field}__user__first_name', f'{assignee_field}__user__last_name', f'{assignee_field}__user__email')
+        [:batch_size]
+    )
+
+def build_reminder(row, assignee_field, role):
+    due_date = timezone.localtime(row['due_date'])
+    return (
+        f"Reminder: your {role} assignment is overdue",
+        f"Dear {row[f'{assignee_field}__user__first_name']} {row[f'{assignee_field}__user__last_name']},\n\n"
+        f"Your {role} assignment for the manuscript \"{row['journal__title']}\" was due on {due_date:%d %B %Y}. "
+        "Please log in to complete it, or contact the editorial office if you need more time.\n\n"
+        "Best regards,\nThe Editorial Team",
+        [row[f'{assignee_field}__user__email']],
+    )
+
+def send_overdue_reminders(model, assignee_field, role, batch_size=REMINDER_BATCH_SIZE, now=None): #queues one reminder per overdue open assignment of the model, returns how many
+    now = now or timezone.now()
+    total = 0
+    # One range scan per open status, the keyset continues where the previous batch stopped instead of rescanning it
+    for assignment_status in model.OPEN_STATUSES:
+        after = None
+        while True:
+            with transaction.atomic():
+                batch = get_overdue_batch(model, assignee_field, assignment_status, now, after, batch_size)
+                if not batch:
+                    break
+                queue_emails([build_reminder(row, assignee_field, role) for row in batch])
+                model.objects.filter(id__in=[row['id'] for row in batch]).update(reminder_sent_at=now)
+            total += len(batch)
+            if len(batch) < batch_size:
+                break
+            after = (batch[-1]['due_date'], batch[-1]['id'])
+    return total
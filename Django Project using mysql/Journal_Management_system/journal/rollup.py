@@ -0,0 +1,57 @@
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+from .models import Journal, JournalStatusRollup
+
+def get_rollup_key(status, subject_area_id, journal_section_id): #the rollup stores 0 instead of NULL
+    return status, subject_area_id or 0, journal_section_id or 0
+
+def get_journal_rollup_key(journal):
+    return get_rollup_key(journal.status, journal.subject_area_id, journal.journal_section_id)
+
+def apply_rollup_deltas(deltas): #adds {(status, subject_area_id, journal_section_id): delta} to the rollup, one UPDATE per changed key
+    for (journal_status, subject_area_id, journal_section_id), delta in deltas.items():
+        if not delta:
+            continue
+        rows = JournalStatusRollup.objects.filter(status=journal_status, subject_area_id=subject_area_id, journal_section_id=journal_section_id)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():  # savepoint, a concurrent insert must not break the caller's transaction
+                JournalStatusRollup.objects.create(
+                    status=journal_status, subject_area_id=subject_area_id, journal_section_id=journal_section_id, count=delta
+                )
+        except IntegrityError:
+            rows.update(count=F('count') + delta)
+
+def record_status_changes(changes): #changes are (from_status, to_status, subject_area_id, journal_section_id) tuples from the transition path
+    deltas = Counter()
+    for from_status, to_status, subject_area_id, journal_section_id in changes:
+        deltas[get_rollup_key(from_status, subject_area_id, journal_section_id)] -= 1
+        deltas[get_rollup_key(to_status, subject_area_id, journal_section_id)] += 1
+    apply_rollup_deltas(deltas)
+
+def merge_rollup_rows(field, value): #folds the rows of a deleted subject area or section into the 0 bucket, like the SET_NULL on the journals
+    deltas = Counter()
+    for row in JournalStatusRollup.objects.filter(**{field: value}):
+        key = {'status': row.status, 'subject_area_id': row.subject_area_id, 'journal_section_id': row.journal_section_id, field: 0}
+        deltas[(key['status'], key['subject_area_id'], key['journal_section_id'])] += row.count
+    JournalStatusRollup.objects.filter(**{field: value}).delete()
+    apply_rollup_deltas(deltas)
+
+def rebuild_rollup(): #recomputes the whole rollup from the journal table with one GROUP BY
+    groups = (
+        Journal.objects
+        .annotate(area=Coalesce('subject_area_id', Value(0)), section=Coalesce('journal_section_id', Value(0)))
+        .values('status', 'area', 'section')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        JournalStatusRollup.objects.all().delete()
+        rows = JournalStatusRollup.objects.bulk_create([
+            JournalStatusRollup(status=group['status'], subject_area_id=group['area'], journal_section_id=group['section'], count=group['total'])
+            for group in groups
+        ])
+    return len(rows)
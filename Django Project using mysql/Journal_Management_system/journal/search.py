@@ -0,0 +1,139 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from .models import Journal
+
+# Fields searched and how much a hit in each one counts towards the relevance score
+FIELD_WEIGHTS = {'title': 3.0, 'keywords': 2.0, 'abstract': 1.0}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with'
+}
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOP_WORDS and len(token) > 1]
+
+class InvertedIndex: #in-process inverted index over title / abstract / keywords, used when the database has no FULLTEXT support (eg. sqlite)
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term -> {journal_id: weighted term frequency}
+        self.doc_terms = {}  # journal_id -> set of terms, needed to remove a document again
+        self.doc_lengths = {}
+        self.lock = threading.Lock()
+        self.built = False
+
+    def build(self):
+        with self.lock:
+            self.postings.clear()
+            self.doc_terms.clear()
+            self.doc_lengths.clear()
+            rows = Journal.objects.values_list('id', 'title', 'abstract', 'keywords').iterator(chunk_size=2000)
+            for journal_id, title, abstract, keywords in rows:
+                self._add(journal_id, {'title': title, 'abstract': abstract, 'keywords': keywords})
+            self.built = True
+
+    def _add(self, journal_id, values):
+        weights = defaultdict(float)
+        length = 0
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(values.get(field))
+            length += len(tokens)
+            for token in tokens:
+                weights[token] += weight
+
+        for term, weight in weights.items():
+            self.postings[term][journal_id] = weight
+        self.doc_terms[journal_id] = set(weights)
+        self.doc_lengths[journal_id] = length or 1
+
+    def _remove(self, journal_id):
+        for term in self.doc_terms.pop(journal_id, ()):
+            documents = self.postings.get(term)
+            if documents is not None:
+                documents.pop(journal_id, None)
+                if not documents:
+                    del self.postings[term]
+        self.doc_lengths.pop(journal_id, None)
+
+    def update(self, journal): #keeps the index current after a journal is saved
+        if not self.built:
+            return
+        with self.lock:
+            self._remove(journal.id)
+            self._add(journal.id, {'title': journal.title, 'abstract': journal.abstract, 'keywords': journal.keywords})
+
+    def delete(self, journal_id):
+        if not self.built:
+            return
+        with self.lock:
+            self._remove(journal_id)
+
+    def score(self, query): #BM25 scores of every journal matching at least one query term
+        if not self.built:
+            self.build()
+
+        terms = set(tokenize(query))
+        total = len(self.doc_lengths)
+        if not terms or not total:
+            return {}
+
+        average_length = sum(self.doc_lengths.values()) / total
+        k1, b = 1.2, 0.75
+        scores = defaultdict(float)
+        with self.lock:
+            for term in terms:
+                documents = self.postings.get(term)
+                if not documents:
+                    continue
+                idf = math.log(1 + (total - len(documents) + 0.5) / (len(documents) + 0.5))
+                for journal_id, frequency in documents.items():
+                    norm = k1 * (1 - b + b * self.doc_lengths[journal_id] / average_length)
+                    scores[journal_id] += idf * frequency * (k1 + 1) / (frequency + norm)
+        return scores
+
+journal_index = InvertedIndex()
+
+def has_fulltext_index():
+    return connection.vendor == 'mysql'
+
+def search_journals(journals, query, limit): #returns [(journal, score)] for the top `limit` matches inside the already filtered queryset
+    if has_fulltext_index():
+        relevance = RawSQL(
+            'MATCH (journal_journal.title, journal_journal.abstract, journal_journal.keywords) AGAINST (%s IN NATURAL LANGUAGE MODE)',
+            [query]
+        )
+        journals = journals.annotate(relevance=relevance).filter(relevance__gt=0).order_by('-relevance', '-id')[:limit]
+        return [(journal, float(journal.relevance)) for journal in journals]
+
+    scores = journal_index.score(query)
+    if not scores:
+        return []
+
+    # Only the candidate ids still allowed by the filters are fetched, ranked in Python
+    allowed = journals.filter(id__in=list(scores)).values_list('id', flat=True)
+    top_ids = sorted(allowed, key=lambda journal_id: (-scores[journal_id], -journal_id))[:limit]
+    by_id = Journal.objects.in_bulk(top_ids)
+    return [(by_id[journal_id], scores[journal_id]) for journal_id in top_ids if journal_id in by_id]
+
+def highlight(text, query, snippet_length=None): #wraps the matched terms in <mark>, optionally cutting a snippet around the first match
+    text = text or ''
+    terms = set(tokenize(query))
+    if not terms:
+        return escape(text[:snippet_length] if snippet_length else text)
+
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r')\b', re.IGNORECASE)
+
+    if snippet_length and len(text) > snippet_length:
+        match = pattern.search(text)
+        start = max(0, (match.start() if match else 0) - snippet_length // 4)
+        end = start + snippet_length
+        text = ('…' if start else '') + text[start:end] + ('…' if end < len(text) else '')
+
+    parts = pattern.split(text)
+    # split() with one group alternates between plain text and matched terms
+    return ''.join(f'<mark>{escape(part)}</mark>' if index % 2 else escape(part) for index, part in enumerate(parts))
@@ -1,5 +1,27 @@
+import json
 from rest_framework import serializers
-from .models import SubjectArea,JournalSection,Journal
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils import html
+from .models import SubjectArea,JournalSection,Journal,JournalStatusEvent
+from .filters import get_multi_values
+
+# Compact shape used by the paginated journal lists, the heavy columns (abstract, supplementary_files, co_authors) are opt-in through ?expand=
+JOURNAL_LIST_FIELDS = [
+    'id', 'title', 'keywords', 'subject_area', 'journal_section', 'language', 'manuscript_file',
+    'corresponding_author', 'author_name_text', 'submission_date', 'status'
+]
+
+class NestedJSONListSerializer(serializers.ListSerializer): #list_serializer_class for nested rows that multipart forms send as one JSON string (educations=[{...}])
+    def get_value(self, dictionary):
+        if html.is_html_input(dictionary) and self.field_name in dictionary:
+            value = dictionary.get(self.field_name)
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    raise ValidationError({self.field_name: "Expected a JSON list."})
+            return value
+        return super().get_value(dictionary)
 
 class SubjectAreaSerializer(serializers.ModelSerializer): #serializer for subject area
     class Meta:
@@ -11,12 +33,57 @@ class JournalSectionSerializer(serializers.ModelSerializer): #serializer for jou
         model = JournalSection
         fields = ['id', 'name']
 
-class JournalSerializer(serializers.ModelSerializer): #serializer for journal
+class JournalSerializer(serializers.ModelSerializer): #serializer for journal, pass fields=[...] to only render a subset of the fields
     class Meta:
         model = Journal
         fields = '__all__'  # Or specify explicitly if you prefer
 
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+def get_requested_journal_fields(query_params, default_fields=None): #reads ?fields= (exact field list) or ?expand= (extra fields on top of the default), None means every field
+    available = list(JournalSerializer().fields)
+
+    if 'fields' in query_params:
+        fields = get_multi_values(query_params, 'fields')
+    elif default_fields is not None:
+        fields = list(default_fields) + get_multi_values(query_params, 'expand')
+    else:
+        return None
+
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise ValidationError({'fields': f"Unknown journal field: {', '.join(unknown)}."})
+
+    return ['id'] + [field for field in dict.fromkeys(fields) if field != 'id']
+
+def narrow_journal_queryset(journals, fields): #loads only the columns the response needs and prefetches co_authors only when they are rendered
+    if fields is None:
+        return journals.prefetch_related('co_authors')
+
+    # submission_date is always loaded since the cursor pagination reads it from the last row
+    columns = [field for field in fields if field != 'co_authors'] + ['submission_date']
+    journals = journals.only(*dict.fromkeys(columns))
+    if 'co_authors' in fields:
+        journals = journals.prefetch_related('co_authors')
+    return journals
+
 class JournalStatusSerializer(serializers.ModelSerializer): #serializer for journal status
     class Meta:
         model = Journal
         fields = ['id', 'title', 'submission_date', 'status']
+
+class JournalStatusEventSerializer(serializers.ModelSerializer): #serializer for the status history of a journal
+    actor_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JournalStatusEvent
+        fields = ['id', 'from_status', 'to_status', 'actor', 'actor_name', 'created_at']
+
+    def get_actor_name(self, obj):
+        return obj.actor.get_full_name() or obj.actor.username if obj.actor else None
@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import SubjectArea, JournalSection, Journal
+from .cache import bump_lookup_version
+from .search import journal_index, has_fulltext_index
+from .rollup import get_rollup_key, get_journal_rollup_key, apply_rollup_deltas, merge_rollup_rows
+from .sync import get_file_fields
+
+@receiver([post_save, post_delete], sender=SubjectArea)
+def invalidate_subject_areas(sender, **kwargs): #covers SubjectAreaCreateAPIView as well as admin edits
+    bump_lookup_version('subject_areas')
+
+@receiver([post_save, post_delete], sender=JournalSection)
+def invalidate_journal_sections(sender, **kwargs):
+    bump_lookup_version('journal_sections')
+
+@receiver(post_save, sender=Journal)
+def index_journal(sender, instance, **kwargs): #keeps the in-process search index current when there is no FULLTEXT index
+    if not has_fulltext_index():
+        journal_index.update(instance)
+
+@receiver(post_delete, sender=Journal)
+def unindex_journal(sender, instance, **kwargs):
+    if not has_fulltext_index():
+        journal_index.delete(instance.id)
+
+@receiver(pre_save, sender=Journal)
+def remember_rollup_key(sender, instance, **kwargs): #status, subject area or section may change on an edit, the old key is needed to move the count
+    instance._rollup_key_before = None
+    if not instance._state.adding and instance.pk:
+        old = Journal.objects.filter(id=instance.pk).values_list('status', 'subject_area_id', 'journal_section_id').first()
+        if old:
+            instance._rollup_key_before = get_rollup_key(*old)
+
+@receiver(post_save, sender=Journal)
+def update_rollup_on_save(sender, instance, created, **kwargs): #status changes through transitions.py use UPDATE and update the rollup there
+    before = getattr(instance, '_rollup_key_before', None)
+    after = get_journal_rollup_key(instance)
+    if created or before is None:
+        apply_rollup_deltas({after: 1})
+    elif before != after:
+        apply_rollup_deltas({before: -1, after: 1})
+
+@receiver(post_delete, sender=Journal)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    apply_rollup_deltas({get_journal_rollup_key(instance): -1})
+
+@receiver(pre_delete, sender=SubjectArea)
+def merge_subject_area_rollup(sender, instance, **kwargs): #the journals' SET_NULL runs as a plain UPDATE without signals
+    merge_rollup_rows('subject_area_id', instance.id)
+
+@receiver(pre_delete, sender=JournalSection)
+def merge_journal_section_rollup(sender, instance, **kwargs):
+    merge_rollup_rows('journal_section_id', instance.id)
+
+def release_on_commit(storage, name): #the reference is only dropped once the row change is committed, a rollback keeps the file
+    transaction.on_commit(lambda: storage.delete(name))
+
+def release_stored_files(sender, instance, **kwargs): #drops the storage reference of every file of a deleted row (ImageField is a FileField too)
+    for field_name in get_file_fields(sender):
+        file = getattr(instance, field_name)
+        if file and file.name:
+            release_on_commit(file.storage, file.name)
+
+def remember_replaced_files(sender, instance, update_fields=None, **kwargs): #a new upload or another name on a kept row replaces the stored file
+    instance._replaced_files = []
+    field_names = get_file_fields(sender)
+    if update_fields is not None:
+        field_names = [field_name for field_name in field_names if field_name in update_fields]
+    if instance._state.adding or not instance.pk or not field_names:
+        return
+
+    stored = sender._base_manager.filter(pk=instance.pk).values(*field_names).first()
+    for field_name, old_name in (stored or {}).items():
+        file = getattr(instance, field_name)
+        # An identical re-upload gets the same name but still took a new reference
+        if old_name and (not file._committed or file.name != old_name):
+            instance._replaced_files.append((file.storage, old_name))
+
+def release_replaced_files(sender, instance, **kwargs):
+    for storage, name in getattr(instance, '_replaced_files', ()):
+        release_on_commit(storage, name)
+    instance._replaced_files = []
+
+def connect_stored_file_receivers(): #only models with a file field get the receivers, a model without post_delete receivers keeps its fast queryset deletes
+    for model in apps.get_models():
+        if get_file_fields(model):
+            pre_save.connect(remember_replaced_files, sender=model)
+            post_save.connect(release_replaced_files, sender=model)
+            post_delete.connect(release_stored_files, sender=model)
+
+connect_stored_file_receivers()
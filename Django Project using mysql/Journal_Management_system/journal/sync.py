@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models import FileField
+
+# Education rows of reviewers and area editors share these fields
+EDUCATION_MATCH_FIELDS = ['degree', 'field_of_study', 'institution']  # natural key used when the client sends no id
+EDUCATION_UPDATE_FIELDS = ['degree', 'field_of_study', 'institution', 'start_year', 'end_year', 'grade_or_score']
+
+def get_match_key(values, match_fields):
+    return tuple(str(values.get(field) or '').strip().lower() for field in match_fields)
+
+def get_file_fields(model):
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, FileField)]
+
+def sync_child_rows(rows, model, parent_field, parent, items, match_fields, update_fields): #makes the parent's child rows equal to items with bulk_update / bulk_create / one delete, unchanged rows keep their id and files
+    existing = list(rows)
+    unused = {row.id: row for row in existing}
+
+    # Every item is paired with an existing row by the id the client sent, else by the natural key. Items matching
+    # nothing become new rows, an unrelated row is never reused since its files belong to a different entry.
+    pairs = []
+    for item in items:
+        row = unused.pop(item.get('id'), None)
+        pairs.append([item, row])
+    for pair in pairs:
+        if pair[1] is None:
+            key = get_match_key(pair[0], match_fields)
+            row = next((row for row in unused.values() if get_match_key(row.__dict__, match_fields) == key), None)
+            if row is not None:
+                pair[1] = unused.pop(row.id)
+
+    file_fields = get_file_fields(model)
+    to_update, to_create, released = [], [], []
+    for item, row in pairs:
+        values = {field: value for field, value in item.items() if field in update_fields}
+        if row is None:
+            to_create.append(model(**{parent_field: parent}, **values))
+            continue
+        changed = any(getattr(row, field) != value for field, value in values.items())
+        if get_match_key({**row.__dict__, **values}, match_fields) != get_match_key(row.__dict__, match_fields):
+            # Edited by id into a different entry, the old certificate no longer proves it
+            for field in file_fields:
+                file = getattr(row, field)
+                if file and file.name:
+                    released.append(file)
+                    setattr(row, field, None)
+        if changed:
+            for field, value in values.items():
+                setattr(row, field, value)
+            to_update.append(row)
+
+    with transaction.atomic():
+        if to_update:
+            model.objects.bulk_update(to_update, update_fields + file_fields)
+        if to_create:
+            model.objects.bulk_create(to_create)
+        if unused:
+            # Deleted through the ORM so the post_delete receivers release their certificate files
+            model.objects.filter(id__in=list(unused)).delete()
+        for file in released:
+            file.storage.delete(file.name)
+
+    return {'updated': len(to_update), 'created': len(to_create), 'deleted': len(unused)}
@@ -1,3 +1,480 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import re
+import shutil
+import tempfile
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.deletion import Collector
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from author.models import Author
+from reviewer.models import Reviewer
+from .models import Journal, SubjectArea, JournalSection, ChunkedUpload, StoredFile, OutboxEmail, JournalStatusEvent, JournalStatusRollup, DeletionOTP
+from .utils import OTP_REQUEST_LIMIT, hash_otp, consume_deletion_otp
+from .search import journal_index
+from .exports import iterate_rows
+from .outbox import MAX_ATTEMPTS, queue_email, send_pending_emails
 
-# Create your tests here.
+class JournalSearchFallbackTests(TestCase): #the in-process BM25 index used without a FULLTEXT index (sqlite) must rank and filter like the MySQL search
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = SubjectArea.objects.create(name='Machine Learning')
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+
+        def create(title, abstract, keywords, **extra):
+            return Journal.objects.create(
+                title=title, abstract=abstract, keywords=keywords, language='en', manuscript_file='journals/x.pdf', corresponding_author=author, **extra
+            )
+
+        cls.title_hit = create('Graph neural networks', 'A study of message passing.', 'deep learning', subject_area=cls.area)
+        cls.keyword_hit = create('Message passing models', 'A study of molecules.', 'graph, chemistry', status='under_review')
+        cls.abstract_hit = create('Protein folding', 'We build a graph of residue contacts for the folding model.', 'biology', subject_area=cls.area)
+        cls.unrelated = create('Medieval trade routes', 'Merchants and their ledgers.', 'history')
+
+    def setUp(self):
+        self.client = APIClient()
+        journal_index.built = False  # rebuilt from this test's rows, other tests may have left ids behind
+
+    def search(self, query_string):
+        response = self.client.get(f'/journal/search/?{query_string}')
+        self.assertEqual(response.status_code, 200)
+        return [result['id'] for result in response.data['results']]
+
+    def test_ranked_by_field_weight(self):
+        self.assertEqual(self.search('q=graph'), [self.title_hit.id, self.keyword_hit.id, self.abstract_hit.id])
+
+    def test_more_matching_terms_rank_higher(self):
+        ids = self.search('q=message passing molecules')
+        self.assertEqual(ids[0], self.keyword_hit.id)
+        self.assertNotIn(self.unrelated.id, ids)
+
+    def test_filters_and_limit(self):
+        self.assertEqual(self.search('q=graph&status=under_review'), [self.keyword_hit.id])
+        self.assertEqual(self.search(f'q=graph&subject_area={self.area.id}'), [self.title_hit.id, self.abstract_hit.id])
+        self.assertEqual(self.search('q=graph&limit=1'), [self.title_hit.id])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.search('q=graph')  # builds the index
+        self.unrelated.title = 'Graph of medieval trade routes'
+        self.unrelated.save()
+        self.assertIn(self.unrelated.id, self.search('q=graph'))
+        self.title_hit.delete()
+        self.assertNotIn(self.title_hit.id, self.search('q=graph'))
+
+    def test_highlights(self):
+        result = self.client.get('/journal/search/?q=graph').data['results'][0]
+        self.assertEqual(result['highlights']['title'], '<mark>Graph</mark> neural networks')
+
+    def test_stop_words_only_and_missing_query(self):
+        self.assertEqual(self.search('q=the of'), [])
+        self.assertEqual(self.client.get('/journal/search/').status_code, 400)
+        self.assertEqual(self.client.get('/journal/search/?q=graph&status=lost').status_code, 400)
+
+class JournalExportTests(TestCase): #exports are read in keyset chunks, filtered like the lists, and safe to open in a spreadsheet
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+        cls.journals = [
+            Journal.objects.create(
+                title=title, abstract='Abstract', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author, status=journal_status
+            )
+            for title, journal_status in (
+                ('=HYPERLINK("http://evil.example")', 'accepted'), ('Plain title', 'submitted'), ('+1 result', 'accepted'),
+                ('@SUM(A1)', 'rejected'), ('-minus', 'accepted'),
+            )
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def export(self, export_format, query_string=''):
+        response = self.client.get(f'/journal/export/{export_format}/?{query_string}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_keyset_chunks_return_every_row_once(self):
+        ids = [journal.id for journal in self.journals]
+        for chunk_size, queries in ((2, 3), (5, 2), (10, 1)):  # a full last chunk needs one more query to find the end
+            with self.assertNumQueries(queries):
+                rows = list(iterate_rows(Journal.objects.all(), ['id'], chunk_size=chunk_size))
+            self.assertEqual([row[0] for row in rows], ids)
+
+    def test_csv_filters_and_formula_cells(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv', 'status=accepted'))))
+        self.assertEqual([int(row['id']) for row in rows], [journal.id for journal in self.journals if journal.status == 'accepted'])
+        self.assertEqual([row['title'] for row in rows], ['\'=HYPERLINK("http://evil.example")', "'+1 result", "'-minus"])
+
+    def test_ndjson_lines_parse(self):
+        lines = self.export('ndjson').splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['id'] for record in records], [journal.id for journal in self.journals])
+        self.assertEqual(records[3]['title'], '@SUM(A1)')  # only the CSV cells are escaped
+        self.assertIn('submission_date', records[0])
+
+    def test_unknown_format_and_filter(self):
+        self.assertEqual(self.client.get('/journal/export/xlsx/').status_code, 404)
+        self.assertEqual(self.client.get('/journal/export/csv/?status=lost').status_code, 400)
+
+def get_rollup_counts():
+    return {(row.status, row.subject_area_id, row.journal_section_id): row.count for row in JournalStatusRollup.objects.exclude(count=0)}
+
+class JournalStatusRollupTests(TestCase): #the rollup must always equal a GROUP BY over the journal table
+    def assertRollupMatchesJournals(self):
+        expected = {
+            (row['status'], row['subject_area_id'] or 0, row['journal_section_id'] or 0): row['total']
+            for row in Journal.objects.values('status', 'subject_area_id', 'journal_section_id').annotate(total=Count('id')).order_by()
+        }
+        self.assertEqual(get_rollup_counts(), expected)
+
+    def test_rollup_follows_every_write(self):
+        physics, chemistry = SubjectArea.objects.create(name='Physics'), SubjectArea.objects.create(name='Chemistry')
+        letters = JournalSection.objects.create(name='Letters')
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+        journals = [
+            Journal.objects.create(
+                title='Paper', abstract='Abstract', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author,
+                subject_area=area, journal_section=section,
+            )
+            for area, section in ((physics, letters), (physics, None), (chemistry, letters), (None, None))
+        ]
+        self.assertRollupMatchesJournals()
+
+        journals[0].status = 'under_review'
+        journals[0].save()
+        self.assertRollupMatchesJournals()
+
+        journals[1].subject_area = chemistry
+        journals[1].journal_section = letters
+        journals[1].save()
+        self.assertRollupMatchesJournals()
+
+        journals[2].status = 'rejected'
+        journals[2].subject_area = None
+        journals[2].save()
+        self.assertRollupMatchesJournals()
+
+        journals[3].delete()
+        self.assertRollupMatchesJournals()
+
+        chemistry.delete()  # the journals' subject area is SET_NULL without signals
+        self.assertRollupMatchesJournals()
+
+        letters.delete()
+        self.assertRollupMatchesJournals()
+
+class JournalTransitionTests(TestCase): #status changes follow ALLOWED_TRANSITIONS, are conditional on the status read and leave an event and the rollup behind
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = SubjectArea.objects.create(name='Physics')
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+        cls.journal = Journal.objects.create(
+            title='Paper', abstract='Abstract', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author, subject_area=cls.area
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def mark(self, action, **data):
+        return self.client.post(f'/journal/mark-{action}/{self.journal.id}/', data, format='json')
+
+    def test_allowed_transition(self):
+        response = self.mark('under-review')
+        self.assertEqual(response.status_code, 200)
+        self.journal.refresh_from_db()
+        self.assertEqual(self.journal.status, 'under_review')
+
+        event = JournalStatusEvent.objects.get(journal=self.journal)
+        self.assertEqual((event.from_status, event.to_status), ('submitted', 'under_review'))
+        self.assertEqual(get_rollup_counts(), {('under_review', self.area.id, 0): 1})
+
+    def test_disallowed_transition(self):
+        self.mark('under-review')
+        response = self.mark('under-review')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['current_status'], 'under_review')
+        self.assertEqual(JournalStatusEvent.objects.count(), 1)
+
+    def test_terminal_status_is_final(self):
+        self.assertEqual(self.mark('accepted').status_code, 200)
+        for action in ('rejected', 'under-review', 'revisions-required'):
+            response = self.mark(action)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data['current_status'], 'accepted')
+        self.journal.refresh_from_db()
+        self.assertEqual(self.journal.status, 'accepted')
+        self.assertEqual(get_rollup_counts(), {('accepted', self.area.id, 0): 1})
+
+    def test_stale_expected_status(self):
+        response = self.mark('accepted', expected_status='under_review')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['current_status'], 'submitted')
+        self.journal.refresh_from_db()
+        self.assertEqual(self.journal.status, 'submitted')
+        self.assertFalse(JournalStatusEvent.objects.exists())
+        self.assertEqual(get_rollup_counts(), {('submitted', self.area.id, 0): 1})
+
+    def test_unknown_journal(self):
+        self.assertEqual(self.client.post('/journal/mark-accepted/999999/').status_code, 404)
+
+class BulkJournalTransitionTests(TestCase): #the bulk endpoint moves every movable journal with one UPDATE and reports the others one by one
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = SubjectArea.objects.create(name='Physics')
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+
+        def create(journal_status):
+            return Journal.objects.create(
+                title='Paper', abstract='Abstract', keywords='x', language='en', manuscript_file='journals/x.pdf',
+                corresponding_author=author, subject_area=cls.area, status=journal_status,
+            )
+
+        cls.submitted = [create('submitted') for _ in range(3)]
+        cls.accepted = create('accepted')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_results_per_journal_with_one_update(self):
+        ids = [journal.id for journal in self.submitted] + [self.accepted.id, 999999]
+        # savepoint, locking read, journal UPDATE, events INSERT, rollup UPDATE x2 + savepoint/INSERT/release for the new key, release
+        with self.assertNumQueries(10), CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/journal/bulk-status/', {'journal_ids': ids, 'status': 'under_review'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        journal_updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE "journal_journal"')]
+        self.assertEqual(len(journal_updates), 1)
+
+        self.assertEqual((response.data['updated'], response.data['failed']), (3, 2))
+        results = response.data['results']
+        for journal in self.submitted:
+            self.assertEqual(results[str(journal.id)], {'success': True, 'from_status': 'submitted', 'new_status': 'under_review'})
+        self.assertEqual(results[str(self.accepted.id)]['current_status'], 'accepted')
+        self.assertFalse(results['999999']['success'])
+
+        self.assertEqual(Journal.objects.filter(status='under_review').count(), 3)
+        self.assertEqual(JournalStatusEvent.objects.filter(to_status='under_review').count(), 3)
+        self.assertEqual(get_rollup_counts(), {('under_review', self.area.id, 0): 3, ('accepted', self.area.id, 0): 1})
+
+    def test_expected_status(self):
+        ids = [self.submitted[0].id, self.accepted.id]
+        response = self.client.post('/journal/bulk-status/', {'journal_ids': ids, 'status': 'rejected', 'expected_status': 'submitted'}, format='json')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['results'][str(self.accepted.id)]['current_status'], 'accepted')
+
+    def test_unknown_status(self):
+        response = self.client.post('/journal/bulk-status/', {'journal_ids': [self.accepted.id], 'status': 'lost'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+class DeletionOTPTests(TestCase): #deletion codes are stored hashed, rate limited, single use and short lived
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='University', country='IN')
+        cls.journal = Journal.objects.create(
+            title='Paper', abstract='Abstract', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=cls.author
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def request_otp(self):
+        response = self.client.post(f'/journal/request-deletion/{self.journal.id}/')
+        self.assertEqual(response.status_code, 200)
+        return re.search(r'(\d{6})$', OutboxEmail.objects.latest('id').message).group(1)
+
+    def test_only_hmac_is_stored(self):
+        otp = self.request_otp()
+        row = DeletionOTP.objects.get()
+        self.assertEqual(row.otp_hash, hash_otp(self.journal.id, otp))
+        self.assertNotIn(otp, row.otp_hash)
+
+    def test_rate_limit(self):
+        for _ in range(OTP_REQUEST_LIMIT):
+            self.request_otp()
+        response = self.client.post(f'/journal/request-deletion/{self.journal.id}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(0 < int(response['Retry-After']) <= 600)
+        self.assertEqual(DeletionOTP.objects.count(), OTP_REQUEST_LIMIT)
+
+    def test_single_use(self):
+        otp = self.request_otp()
+        self.assertTrue(consume_deletion_otp(self.author, self.journal, otp))
+        self.assertFalse(consume_deletion_otp(self.author, self.journal, otp))
+
+    def test_new_code_invalidates_earlier_one(self):
+        first = self.request_otp()
+        second = self.request_otp()
+        self.assertFalse(consume_deletion_otp(self.author, self.journal, first))
+        self.assertTrue(consume_deletion_otp(self.author, self.journal, second))
+
+    def test_expired_code(self):
+        otp = self.request_otp()
+        DeletionOTP.objects.update(created_at=timezone.now() - DeletionOTP.VALIDITY - timedelta(seconds=1))
+        self.assertFalse(consume_deletion_otp(self.author, self.journal, otp))
+
+    def test_confirm_deletion(self):
+        otp = self.request_otp()
+        wrong = '000000' if otp != '000000' else '111111'
+        self.assertEqual(self.client.post(f'/journal/confirm-deletion/{self.journal.id}/', {'otp': wrong}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(f'/journal/confirm-deletion/{self.journal.id}/', {'otp': otp}, format='json').status_code, 204)
+        self.assertFalse(Journal.objects.filter(id=self.journal.id).exists())
+
+class ChunkedUploadAttachTests(TestCase): #resumable uploads must never leave half submitted journals or touch decided ones
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.upload_dir = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, CHUNKED_UPLOAD_DIR=self.upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+        self.addCleanup(shutil.rmtree, self.upload_dir, True)
+
+        self.client = APIClient()
+        user = User.objects.create_user(username='author', email='author@example.org', first_name='Ada', last_name='Author')
+        self.author = Author.objects.create(user=user, institution='University', country='IN')
+        self.journal = Journal.objects.create(
+            title='Paper', abstract='Abstract', keywords='graphs', language='en',
+            manuscript_file=ContentFile(b'first manuscript', name='first.pdf'), corresponding_author=self.author
+        )
+
+    def upload(self, data, target='manuscript'):
+        response = self.client.post(f'/journal/uploads/start/{self.author.id}/', {'filename': 'paper.pdf', 'total_size': len(data), 'target': target}, format='json')
+        upload_id = response.data['upload_id']
+        self.client.generic('PATCH', f'/journal/uploads/{upload_id}/', data, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0')
+        return upload_id
+
+    def submit(self, upload_id, **extra):
+        data = {'title': 'New paper', 'abstract': 'Abstract', 'keywords': 'graphs', 'language': 'en', 'manuscript_upload_id': upload_id, **extra}
+        return self.client.post(f'/journal/submit-journal/{self.author.id}/', data, format='multipart')
+
+    def test_malformed_upload_id(self):
+        response = self.submit('not-a-uuid')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Journal.objects.count(), 1)
+
+    def test_failed_attach_creates_no_journal(self):
+        upload_id = self.upload(b'new manuscript')
+        response = self.submit(upload_id, status='accepted')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Journal.objects.count(), 1)
+        self.assertEqual(ChunkedUpload.objects.get(id=upload_id).status, 'uploading')
+
+    def test_replacing_manuscript_releases_old_file(self):
+        old_name = self.journal.manuscript_file.name
+        response = self.client.post(f'/journal/uploads/{self.upload(b"second manuscript")}/complete/{self.journal.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(StoredFile.objects.filter(name=old_name).exists())
+
+    def test_accepted_manuscript_is_frozen(self):
+        Journal.objects.filter(id=self.journal.id).update(status='accepted')
+        response = self.client.post(f'/journal/uploads/{self.upload(b"overwrite")}/complete/{self.journal.id}/')
+        self.assertEqual(response.status_code, 409)
+        self.journal.refresh_from_db()
+        self.assertEqual(self.journal.manuscript_file.read(), b'first manuscript')
+
+    def test_supplementary_files_are_gated(self):
+        response = self.client.post(f'/journal/uploads/{self.upload(b"data", "supplementary")}/complete/{self.journal.id}/')
+        path = response.data['supplementary_files'][0]
+        self.assertEqual(self.client.get(path).status_code, 403)
+        token = RefreshToken.for_user(self.author.user).access_token
+        self.assertEqual(self.client.get(f'{path}?token={token}').status_code, 200)
+
+class StoredFileReferenceTests(TestCase): #a stored file goes away with the last row pointing at it, whether the row is deleted or its file replaced
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+
+    def create_reviewer(self, username, resume):
+        user = User.objects.create_user(username=username, email=f'{username}@example.org')
+        return Reviewer.objects.create(user=user, institution='University', resume=ContentFile(resume, name='cv.pdf'))
+
+    def replace_resume(self, reviewer, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            reviewer.resume = ContentFile(content, name='cv.pdf')
+            reviewer.save()
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.create_reviewer('first', b'same resume')
+        second = self.create_reviewer('second', b'same resume')
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertEqual(StoredFile.objects.get(name=first.resume.name).ref_count, 2)
+
+    def test_replaced_file_is_released(self):
+        reviewer = self.create_reviewer('reviewer', b'old resume')
+        old_name = reviewer.resume.name
+        self.replace_resume(reviewer, b'new resume')
+        self.assertFalse(StoredFile.objects.filter(name=old_name).exists())
+        self.assertFalse(reviewer.resume.storage.exists(old_name))
+        self.assertEqual(StoredFile.objects.get(name=reviewer.resume.name).ref_count, 1)
+
+    def test_identical_reupload_keeps_one_reference(self):
+        reviewer = self.create_reviewer('reviewer', b'resume')
+        self.replace_resume(reviewer, b'resume')
+        self.assertEqual(StoredFile.objects.get(name=reviewer.resume.name).ref_count, 1)
+
+    def test_shared_file_survives_until_last_row(self):
+        first = self.create_reviewer('first', b'same resume')
+        second = self.create_reviewer('second', b'same resume')
+        name = first.resume.name
+        self.replace_resume(first, b'other resume')
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse(first.resume.storage.exists(name))
+
+    def test_rolled_back_replace_keeps_file(self):
+        reviewer = self.create_reviewer('reviewer', b'old resume')
+        old_name = reviewer.resume.name
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    reviewer.resume = ContentFile(b'new resume', name='cv.pdf')
+                    reviewer.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(StoredFile.objects.get(name=old_name).ref_count, 1)
+        self.assertTrue(reviewer.resume.storage.exists(old_name))
+
+    def test_models_without_files_keep_fast_deletes(self):
+        collector = Collector(using='default')
+        for model in (OutboxEmail, ChunkedUpload, StoredFile):
+            self.assertTrue(collector.can_fast_delete(model.objects.all()))
+
+class UnreachableEmailBackend(BaseEmailBackend): #mail server that refuses every connection
+    def open(self):
+        raise ConnectionRefusedError("Connection refused")
+
+    def send_messages(self, email_messages):
+        return 0
+
+@override_settings(EMAIL_BACKEND='journal.tests.UnreachableEmailBackend')
+class OutboxConnectionFailureTests(TestCase): #a mail server that can't be reached must use up attempts like a failed send
+    def test_attempts_are_counted(self):
+        email = queue_email('Subject', 'Message', ['someone@example.org'])
+        self.assertEqual(send_pending_emails(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.last_error, 'Connection refused')
+        self.assertGreater(email.next_attempt_at, email.created_at)
+
+    def test_gives_up_after_max_attempts(self):
+        email = queue_email('Subject', 'Message', ['someone@example.org'])
+        OutboxEmail.objects.filter(id=email.id).update(attempts=MAX_ATTEMPTS - 1)
+        send_pending_emails()
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, MAX_ATTEMPTS)
+        self.assertEqual(email.status, 'failed')
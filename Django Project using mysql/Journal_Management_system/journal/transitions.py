@@ -0,0 +1,95 @@
+from django.db import transaction
+from .models import Journal, JournalStatusEvent
+from .rollup import record_status_changes
+
+# Status -> statuses it may move to. accepted and rejected are final.
+ALLOWED_TRANSITIONS = {
+    'submitted': {'under_review', 'revisions_required', 'accepted', 'rejected'},
+    'under_review': {'review_done', 'revisions_required', 'accepted', 'rejected'},
+    'review_done': {'under_review', 'revisions_required', 'accepted', 'rejected'},
+    'revisions_required': {'submitted', 'under_review', 'accepted', 'rejected'},
+    'accepted': set(),
+    'rejected': set(),
+}
+
+class TransitionError(Exception): #raised when a status change is refused, carries the HTTP status to answer with and the status found in the database
+    def __init__(self, message, status_code, current_status=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.current_status = current_status
+
+def can_transition(from_status, to_status):
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, ())
+
+def get_source_statuses(to_status): #statuses a journal may be in to move to to_status
+    return [from_status for from_status, targets in ALLOWED_TRANSITIONS.items() if to_status in targets]
+
+def get_actor(user):
+    return user if user is not None and user.is_authenticated else None
+
+def transition_journal(journal_id, to_status, actor=None, expected_status=None): #moves one journal with a conditional UPDATE and logs the event, returns the previous status
+    if to_status not in ALLOWED_TRANSITIONS:
+        raise TransitionError(f'Unknown status "{to_status}".', 400)
+
+    with transaction.atomic():
+        from_status = expected_status
+        journal_row = None
+        if from_status is None:
+            journal_row = Journal.objects.filter(id=journal_id).values_list('status', 'subject_area_id', 'journal_section_id').first()
+            if journal_row is None:
+                raise TransitionError("Journal not found.", 404)
+            from_status = journal_row[0]
+
+        if not can_transition(from_status, to_status):
+            raise TransitionError(f'Journal can\'t move from "{from_status}" to "{to_status}".', 409, from_status)
+
+        # Only the status column is written, and only while it still holds the status the decision was based on
+        updated = Journal.objects.filter(id=journal_id, status=from_status).update(status=to_status)
+        if not updated:
+            current_status = Journal.objects.filter(id=journal_id).values_list('status', flat=True).first()
+            if current_status is None:
+                raise TransitionError("Journal not found.", 404)
+            raise TransitionError(f'Journal status changed to "{current_status}" in the meantime.', 409, current_status)
+
+        JournalStatusEvent.objects.create(journal_id=journal_id, from_status=from_status, to_status=to_status, actor=get_actor(actor))
+
+        if journal_row is None:  # expected_status skipped the read, the rollup still needs the subject area and section
+            journal_row = Journal.objects.filter(id=journal_id).values_list('status', 'subject_area_id', 'journal_section_id').first()
+        record_status_changes([(from_status, to_status, journal_row[1], journal_row[2])])
+
+    return from_status
+
+def transition_journals(journal_ids, to_status, actor=None, expected_status=None): #moves many journals in one transaction with a single UPDATE, returns a result per id
+    if to_status not in ALLOWED_TRANSITIONS:
+        raise TransitionError(f'Unknown status "{to_status}".', 400)
+
+    results = {}
+    with transaction.atomic():
+        # The rows are locked so the statuses read here are still current when the UPDATE runs
+        rows = list(Journal.objects.select_for_update().filter(id__in=journal_ids).values_list('id', 'status', 'subject_area_id', 'journal_section_id'))
+        groups = {journal_id: (subject_area_id, journal_section_id) for journal_id, _, subject_area_id, journal_section_id in rows}
+        current = {journal_id: journal_status for journal_id, journal_status, _, _ in rows}
+
+        movable = {}
+        for journal_id in journal_ids:
+            from_status = current.get(journal_id)
+            if from_status is None:
+                results[journal_id] = {'success': False, 'error': "Journal not found."}
+            elif expected_status is not None and from_status != expected_status:
+                results[journal_id] = {'success': False, 'error': f'Journal is "{from_status}", not "{expected_status}".', 'current_status': from_status}
+            elif not can_transition(from_status, to_status):
+                results[journal_id] = {'success': False, 'error': f'Journal can\'t move from "{from_status}" to "{to_status}".', 'current_status': from_status}
+            else:
+                movable[journal_id] = from_status
+
+        if movable:
+            Journal.objects.filter(id__in=list(movable), status__in=get_source_statuses(to_status)).update(status=to_status)
+            JournalStatusEvent.objects.bulk_create([
+                JournalStatusEvent(journal_id=journal_id, from_status=from_status, to_status=to_status, actor=get_actor(actor))
+                for journal_id, from_status in movable.items()
+            ])
+            record_status_changes([(from_status, to_status) + groups[journal_id] for journal_id, from_status in movable.items()])
+            for journal_id, from_status in movable.items():
+                results[journal_id] = {'success': True, 'from_status': from_status, 'new_status': to_status}
+
+    return results
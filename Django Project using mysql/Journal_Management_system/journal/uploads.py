@@ -0,0 +1,124 @@
+import hashlib
+import os
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.text import get_valid_filename
+from .models import ChunkedUpload, Journal
+
+CHUNK_SIZE = 4 * 1024 * 1024  # size suggested to the client, every chunk is still streamed to disk
+READ_SIZE = 64 * 1024
+MAX_UPLOAD_SIZE = 500 * 1024 * 1024
+EDITABLE_STATUSES = ('submitted', 'revisions_required')  # files of a journal under review or decided are frozen
+
+class ChunkError(Exception): #raised when a chunk can't be appended, carries the HTTP status to answer with
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def get_upload_dir():
+    return getattr(settings, 'CHUNKED_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'chunked_uploads'))
+
+def get_part_path(upload):
+    return os.path.join(get_upload_dir(), f'{upload.id}.part')
+
+def parse_checksum(header): #"sha256 <hex digest>" like the tus checksum extension
+    if not header:
+        return None
+    algorithm, _, digest = header.strip().partition(' ')
+    if algorithm.lower() != 'sha256' or not digest:
+        raise ChunkError("Upload-Checksum must look like 'sha256 <hex digest>'.", 400)
+    return digest.strip().lower()
+
+def append_chunk(upload, stream, offset, length, checksum=None): #writes the chunk at the current offset while hashing it, rolls back on a checksum mismatch
+    if upload.status != 'uploading':
+        raise ChunkError("This upload is already complete.", 409)
+    if offset != upload.offset:
+        raise ChunkError(f"Upload-Offset {offset} does not match the server offset {upload.offset}.", 409)
+    if length <= 0:
+        raise ChunkError("Empty chunk.", 400)
+    if upload.offset + length > upload.total_size:
+        raise ChunkError("Chunk goes past the declared total_size.", 400)
+
+    os.makedirs(get_upload_dir(), exist_ok=True)
+    part_path = get_part_path(upload)
+    digest = hashlib.sha256()
+    written = 0
+
+    with open(part_path, 'ab') as part_file:
+        part_file.truncate(upload.offset)  # drop any leftover of an interrupted chunk
+        remaining = length
+        while remaining > 0:
+            data = stream.read(min(READ_SIZE, remaining))
+            if not data:
+                break
+            part_file.write(data)
+            digest.update(data)
+            written += len(data)
+            remaining -= len(data)
+
+        if written != length or (checksum and digest.hexdigest() != checksum):
+            part_file.truncate(upload.offset)
+            if written != length:
+                raise ChunkError("Connection closed before the whole chunk arrived.", 400)
+            raise ChunkError("Checksum mismatch, the chunk was discarded.", 460)
+
+    # Conditional update so two clients resuming the same upload can't both move the offset
+    updated = ChunkedUpload.objects.filter(id=upload.id, offset=offset).update(offset=offset + written)
+    if not updated:
+        raise ChunkError("The upload offset changed while the chunk was being written.", 409)
+    upload.offset = offset + written
+    return upload.offset
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part_file:
+        for data in iter(lambda: part_file.read(READ_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+def attach_upload(upload, journal, sha256=None): #moves the finished part file into storage and links it to the journal
+    if upload.status != 'uploading':
+        raise ChunkError("This upload was already attached.", 409)
+    if upload.offset != upload.total_size:
+        raise ChunkError(f"Upload is incomplete ({upload.offset}/{upload.total_size} bytes).", 400)
+
+    part_path = get_part_path(upload)
+    if sha256 and file_sha256(part_path) != sha256.lower():
+        raise ChunkError("Checksum of the assembled file does not match.", 460)
+
+    filename = get_valid_filename(os.path.basename(upload.filename)) or 'upload'
+    with transaction.atomic():
+        # Locked so a status transition can't slip in between the check and the file swap
+        current = Journal.objects.select_for_update().filter(id=journal.id).values('status', 'manuscript_file').first()
+        if current is None or current['status'] not in EDITABLE_STATUSES:
+            raise ChunkError("The files of this journal can no longer be changed.", 409)
+
+        with open(part_path, 'rb') as part_file:
+            if upload.target == 'manuscript':
+                # FileField.save copies through the storage in chunks, the file is never held in memory
+                journal.manuscript_file.save(filename, File(part_file), save=False)
+                Journal.objects.filter(id=journal.id).update(manuscript_file=journal.manuscript_file.name)
+                if current['manuscript_file']:
+                    # The replaced manuscript drops its storage reference, an identical re-upload just counts down again
+                    journal.manuscript_file.storage.delete(current['manuscript_file'])
+            else:
+                name = default_storage.save(f'journals/supplementary/{filename}', File(part_file))
+                existing = journal.supplementary_files
+                if not isinstance(existing, list):
+                    existing = [existing] if existing else []
+                journal.supplementary_files = existing + [default_storage.url(name)]
+                Journal.objects.filter(id=journal.id).update(supplementary_files=journal.supplementary_files)
+
+        upload.status = 'complete'
+        upload.save(update_fields=['status', 'updated_at'])
+
+    os.remove(part_path)
+    return journal
+
+def discard_upload(upload):
+    part_path = get_part_path(upload)
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    upload.delete()
@@ -9,6 +9,7 @@ urlpatterns = [
     path('journal-sections/', JournalSectionListAPIView.as_view(), name='journalsection-list'), #end point to get all journal sections (GET request)
     path('submit-journal/<int:author_id>/', SubmitJournalAPIView.as_view(), name='submit-journal'), #end point to submit journal by the author
     path('get-all/', JournalListAPIView.as_view(), name='journal-list'), #end point to get all journals (GET request)
+    path('detail/', JournalBatchDetailAPIView.as_view(), name='journal-batch-detail'), #end point to get many journal details in one call by ?ids=1,2,3 (GET request), results are keyed by id and unknown ids are listed under "missing"
     path('detail/<int:journal_id>/', JournalDetailAPIView.as_view(), name='journal-detail'), #end point to get journal details by journal id (GET request) 
     path('submittedby-author/<int:author_id>/', JournalsByAuthorAPIView.as_view(), name='journals-by-author'), #end point to update the journal details by hournal id (PUT request)
     path('update-before-review/<int:journal_id>/', UpdateJournalBeforeReviewAPIView.as_view(), name='update-journal-before-review'), #end point to update journal details before the review phase (PATCH request)
@@ -30,5 +31,20 @@ urlpatterns = [
     path('mark-revisions-required/<int:journal_id>/', SetJournalRevisionsRequiredAPIView.as_view(), name='mark-revisions-required'), #end point to mark journal as revisions required (POST request)
     path('mark-accepted/<int:journal_id>/', SetJournalAcceptedAPIView.as_view(), name='mark-accepted'), #end point to mark journal as accepted (POST request)
     path('mark-rejected/<int:journal_id>/', SetJournalRejectedAPIView.as_view(), name='mark-rejected'), #end point to mark journal as rejected (POST request)
+    path('bulk-status/', BulkJournalStatusAPIView.as_view(), name='bulk-journal-status'), #end point to change the status of many journals in one transaction (POST request) with a result per journal id
+    path('status-history/<int:journal_id>/', JournalStatusHistoryAPIView.as_view(), name='journal-status-history'), #end point to get every status change of a journal with who made it and when (GET request)
+
+    #resumable chunked upload of manuscripts and supplementary files
+    path('uploads/start/<int:author_id>/', StartChunkedUploadAPIView.as_view(), name='chunked-upload-start'), #end point to start an upload (POST request) returns the upload_id
+    path('uploads/<uuid:upload_id>/', ChunkedUploadAPIView.as_view(), name='chunked-upload'), #end point to get the current offset (GET/HEAD request) or send the next chunk with Upload-Offset / Upload-Checksum headers (PATCH request)
+    path('uploads/<uuid:upload_id>/complete/<int:journal_id>/', CompleteChunkedUploadAPIView.as_view(), name='chunked-upload-complete'), #end point to attach the finished upload to the journal (POST request)
+
     path('not-accepted-or-rejected/', NotAcceptedOrRejectedJournalsAPIView.as_view(), name='not-accepted-or-rejected-journals'),
+    path('search/', JournalSearchAPIView.as_view(), name='journal-search'), #end point to search journals by title, abstract and keywords (GET request) with ?q= plus the same filters as query/
+    path('by-keyword/', JournalsByKeywordAPIView.as_view(), name='journals-by-keyword'), #end point to get the journals tagged with ?keyword= (GET request)
+    path('keywords/facet/', KeywordFacetAPIView.as_view(), name='keyword-facet'), #end point to get the keyword counts for the filtered journals (GET request)
+    path('keywords/autocomplete/', KeywordAutocompleteAPIView.as_view(), name='keyword-autocomplete'), #end point to suggest keywords by ?prefix= (GET request)
+    path('export/<str:export_format>/', JournalExportAPIView.as_view(), name='journal-export'), #end point to stream the filtered journals as csv or ndjson (GET request) with the same filters as query/
+    path('stats/', JournalStatsAPIView.as_view(), name='journal-stats'), #end point to get journal counts by status, subject area and section without listing the journals (GET request)
+    path('query/', JournalQueryAPIView.as_view(), name='journal-query'), #end point to filter journals by status, subject_area, journal_section, author and submitted_from/submitted_to with per-status counts (GET request)
 ]
@@ -1,13 +1,68 @@
-import random
-from django.core.mail import send_mail
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import DeletionOTP
+from .outbox import queue_email
+
+OTP_REQUEST_LIMIT = 3  # deletion OTPs an author may request per window, across all of their journals
+OTP_REQUEST_WINDOW = timedelta(minutes=10)
+
+class OTPRateLimited(Exception): #raised when an author asks for too many OTPs, carries the seconds until the next one is allowed
+    def __init__(self, retry_after):
+        super().__init__("Too many OTP requests.")
+        self.retry_after = retry_after
 
 def generate_otp():
-    return f"{random.randint(100000, 999999)}"
+    return f"{secrets.randbelow(900000) + 100000}"
+
+def hash_otp(journal_id, otp): #keyed with SECRET_KEY so a leaked table can't be brute forced offline
+    message = f"{journal_id}:{otp}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
 
-def send_otp_email(user_email, otp):
-    send_mail(
+def send_otp_email(user_email, otp): #queued in the outbox, the send_outbox worker delivers it
+    queue_email(
         subject='OTP for Journal Deletion',
         message=f'Your OTP to delete the journal is: {otp}',
         from_email='noreply@yourdomain.com',
         recipient_list=[user_email],
     )
+
+def issue_deletion_otp(author, journal): #creates and mails a new OTP, earlier unused codes for the journal stop working
+    from author.models import Author
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Locking the author row serializes concurrent requests so the rate limit can't be raced
+        Author.objects.select_for_update().filter(id=author.id).first()
+
+        recent = list(
+            DeletionOTP.objects.filter(author=author, created_at__gte=now - OTP_REQUEST_WINDOW)
+            .order_by('created_at').values_list('created_at', flat=True)[:OTP_REQUEST_LIMIT]
+        )
+        if len(recent) >= OTP_REQUEST_LIMIT:
+            retry_after = recent[0] + OTP_REQUEST_WINDOW - now
+            raise OTPRateLimited(max(int(retry_after.total_seconds()) + 1, 1))
+
+        DeletionOTP.objects.filter(author=author, journal_id=journal.id, used_at__isnull=True).update(used_at=now)
+        otp = generate_otp()
+        DeletionOTP.objects.create(author=author, journal_id=journal.id, otp_hash=hash_otp(journal.id, otp))
+        send_otp_email(author.user.email, otp)
+
+def consume_deletion_otp(author, journal, otp): #marks a matching, unexpired and unused OTP as used, returns False when there is none
+    if not otp:
+        return False
+
+    now = timezone.now()
+    # A single conditional UPDATE, of two concurrent confirmations only one can flip used_at
+    consumed = DeletionOTP.objects.filter(
+        journal_id=journal.id,
+        author=author,
+        otp_hash=hash_otp(journal.id, str(otp).strip()),
+        used_at__isnull=True,
+        created_at__gt=now - DeletionOTP.VALIDITY,
+    ).update(used_at=now)
+    return consumed > 0
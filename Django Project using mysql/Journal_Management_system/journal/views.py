@@ -4,13 +4,48 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import SubjectArea,JournalSection,Journal,DeletionOTP
-from .serializers import SubjectAreaSerializer,JournalSectionSerializer,JournalSerializer,JournalStatusSerializer
+from .models import SubjectArea,JournalSection,Journal
+from .serializers import SubjectAreaSerializer,JournalSectionSerializer,JournalSerializer,JournalStatusSerializer,JournalStatusEventSerializer
+from .serializers import JOURNAL_LIST_FIELDS, get_requested_journal_fields, narrow_journal_queryset
 from rest_framework.generics import ListAPIView
 from author.models import Author
 from rest_framework.parsers import MultiPartParser
 from django.shortcuts import get_object_or_404
-from .utils import generate_otp, send_otp_email
+from .utils import issue_deletion_otp, consume_deletion_otp, OTPRateLimited
+from .pagination import JournalCursorPagination
+from .filters import filter_journals, get_id_values, JOURNAL_STATUSES
+from django.db.models import Count
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.utils.http import parse_etags
+from .cache import get_cached_lookup
+from .search import search_journals, highlight
+from .keywords import sync_journal_keywords, normalize_keyword
+from .models import Keyword, ChunkedUpload, JournalStatusEvent, JournalStatusRollup
+from .transitions import TransitionError, transition_journal, transition_journals
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from .exports import export_response
+from .uploads import ChunkError, CHUNK_SIZE, MAX_UPLOAD_SIZE, append_chunk, attach_upload, parse_checksum
+
+class JournalListPaginationMixin: #class to paginate the journal lists with an opaque cursor when the client asks for it (?cursor= or ?page_size=)
+    pagination_class = JournalCursorPagination
+
+    def paginated_response(self, request, journals, default_fields=JOURNAL_LIST_FIELDS, force_pagination=False):
+        paginate = force_pagination or 'cursor' in request.query_params or 'page_size' in request.query_params
+
+        # Paginated clients get the compact list shape, the plain list keeps every field for the existing frontends
+        fields = get_requested_journal_fields(request.query_params, default_fields if paginate else None)
+        journals = narrow_journal_queryset(journals, fields)
+
+        if not paginate:
+            serializer = JournalSerializer(journals, many=True, fields=fields)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(journals, request, view=self)
+        serializer = JournalSerializer(page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
 
 class SubjectAreaCreateAPIView(APIView): # end point to add subject area by the admin
     def post(self, request, *args, **kwargs):
@@ -28,13 +63,33 @@ class JournalSectionCreateAPIView(APIView): # end point to add journal section b
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-class SubjectAreaListAPIView(ListAPIView): #end point to get all subject areas
+class CachedLookupListMixin: #class to serve a small lookup table from the cache with a strong ETag, repeat loads get a 304 without touching the database
+    cache_name = None  # To be set by subclasses
+
+    def list(self, request, *args, **kwargs):
+        cached = get_cached_lookup(
+            self.cache_name,
+            lambda: self.get_serializer(self.get_queryset(), many=True).data
+        )
+
+        if cached['etag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(cached['data'], status=status.HTTP_200_OK)
+
+        response['ETag'] = cached['etag']
+        response['Cache-Control'] = 'no-cache'  # browsers revalidate with If-None-Match every time
+        return response
+
+class SubjectAreaListAPIView(CachedLookupListMixin, ListAPIView): #end point to get all subject areas
     queryset = SubjectArea.objects.all()
     serializer_class = SubjectAreaSerializer
+    cache_name = 'subject_areas'
 
-class JournalSectionListAPIView(ListAPIView): #end point to get all journal section
+class JournalSectionListAPIView(CachedLookupListMixin, ListAPIView): #end point to get all journal section
     queryset = JournalSection.objects.all()
     serializer_class = JournalSectionSerializer
+    cache_name = 'journal_sections'
 
 class SubmitJournalAPIView(APIView):  # endpoint to submit journal by the author
     parser_classes = [MultiPartParser]
@@ -52,32 +107,53 @@ class SubmitJournalAPIView(APIView):  # endpoint to submit journal by the author
         co_authors = request.data.getlist('co_authors')
         files = request.FILES
 
-        journal = Journal.objects.create(
-            title=data.get('title'),
-            abstract=data.get('abstract'),
-            keywords=data.get('keywords'),
-            subject_area_id=data.get('subject_area'),
-            journal_section_id=data.get('journal_section'),
-            language=data.get('language'),
-            manuscript_file=files.get('manuscript_file'),
-            supplementary_files=data.get('supplementary_files') or None,
-            corresponding_author=author,
-            author_name_text=f"{author.user.first_name} {author.user.last_name}",  # ✅ Auto-fill author name
-            status=data.get('status', 'submitted'),
-        )
+        # The manuscript can also come from a finished resumable upload instead of the multipart body,
+        # it is checked before anything is created so a bad id leaves no half submitted journal behind
+        upload = None
+        upload_id = data.get('manuscript_upload_id')
+        if upload_id and not files.get('manuscript_file'):
+            try:
+                upload = ChunkedUpload.objects.filter(id=upload_id, author=author, target='manuscript').first()
+            except (ValidationError, ValueError):
+                return Response({'error': 'Invalid upload id'}, status=400)
+            if upload is None:
+                return Response({'error': 'Upload not found'}, status=404)
+            if upload.status != 'uploading' or upload.offset != upload.total_size:
+                return Response({'error': 'Upload is already attached or incomplete'}, status=409)
 
-        if co_authors:
-            journal.co_authors.set(co_authors)
-
-        journal.save()
+        try:
+            with transaction.atomic():
+                journal = Journal.objects.create(
+                    title=data.get('title'),
+                    abstract=data.get('abstract'),
+                    keywords=data.get('keywords'),
+                    subject_area_id=data.get('subject_area'),
+                    journal_section_id=data.get('journal_section'),
+                    language=data.get('language'),
+                    manuscript_file=files.get('manuscript_file'),
+                    supplementary_files=data.get('supplementary_files') or None,
+                    corresponding_author=author,
+                    author_name_text=f"{author.user.first_name} {author.user.last_name}",  # ✅ Auto-fill author name
+                    status=data.get('status', 'submitted'),
+                )
+
+                if co_authors:
+                    journal.co_authors.set(co_authors)
+
+                journal.save()
+                sync_journal_keywords(journal)
+
+                if upload is not None:
+                    attach_upload(upload, journal)
+        except ChunkError as e:
+            return Response({'error': str(e)}, status=e.status_code)
 
         return Response({'message': 'Journal submitted successfully'}, status=201)
     
-class JournalListAPIView(APIView): #end point to get all the journals (GET request)
+class JournalListAPIView(JournalListPaginationMixin, APIView): #end point to get all the journals (GET request)
     def get(self, request, *args, **kwargs):
         journals = Journal.objects.all()
-        serializer = JournalSerializer(journals, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(request, journals)
     
 class JournalDetailAPIView(APIView): #end point to get journal details by journal id (GET request)
     def get(self, request, journal_id, *args, **kwargs):
@@ -85,12 +161,28 @@ class JournalDetailAPIView(APIView): #end point to get journal details by journa
         serializer = JournalSerializer(journal)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-class JournalsByAuthorAPIView(APIView): #end point to get journal by a particular author (GET request)
+class JournalBatchDetailAPIView(APIView): #end point to get the details of many journals at once by ?ids=1,2,3 (GET request)
+    max_ids = 300
+
+    def get(self, request, *args, **kwargs):
+        journal_ids = list(dict.fromkeys(get_id_values(request.query_params, 'ids')))  # drop duplicates, keep the order
+        if not journal_ids:
+            return Response({"error": "Pass the journal ids as ?ids=1,2,3"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(journal_ids) > self.max_ids:
+            return Response({"error": f"At most {self.max_ids} ids can be requested at once."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = get_requested_journal_fields(request.query_params)
+        journals = narrow_journal_queryset(Journal.objects.filter(id__in=journal_ids), fields)
+        results = {str(journal['id']): journal for journal in JournalSerializer(journals, many=True, fields=fields).data}
+        missing = [journal_id for journal_id in journal_ids if str(journal_id) not in results]
+
+        return Response({'results': results, 'missing': missing}, status=status.HTTP_200_OK)
+
+class JournalsByAuthorAPIView(JournalListPaginationMixin, APIView): #end point to get journal by a particular author (GET request)
     def get(self, request, author_id, *args, **kwargs):
         author = get_object_or_404(Author, id=author_id)
         journals = Journal.objects.filter(corresponding_author=author)
-        serializer = JournalSerializer(journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, journals)
 
 class UpdateJournalBeforeReviewAPIView(APIView): #end point to update journal details before the review phase (PATCH request)
     def patch(self, request, journal_id, *args, **kwargs):
@@ -106,6 +198,8 @@ class UpdateJournalBeforeReviewAPIView(APIView): #end point to update journal de
         serializer = JournalSerializer(journal, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            if 'keywords' in serializer.validated_data:
+                sync_journal_keywords(journal)
             return Response(serializer.data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -125,9 +219,14 @@ class RequestJournalDeletionAPIView(APIView): #end point to request journal dele
         if journal.status != 'submitted':
             return Response({"error": "Journal cannot be deleted unless it is still submitted."}, status=400)
 
-        otp = generate_otp()
-        DeletionOTP.objects.create(author=author, journal_id=journal.id, otp=otp)
-        send_otp_email(author.user.email, otp)
+        try:
+            issue_deletion_otp(author, journal)
+        except OTPRateLimited as e:
+            return Response(
+                {"error": "Too many OTP requests, please try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(e.retry_after)}
+            )
 
         return Response({"message": "OTP sent to registered email."}, status=200)
 
@@ -137,66 +236,55 @@ class ConfirmJournalDeletionAPIView(APIView): #end point to confirm journ delete
         journal = get_object_or_404(Journal, id=journal_id)
         author = journal.corresponding_author
 
-        try:
-            otp_obj = DeletionOTP.objects.filter(
-                author=author, journal_id=journal.id, otp=otp_input
-            ).latest('created_at')
-        except DeletionOTP.DoesNotExist:
-            return Response({"error": "Invalid or expired OTP."}, status=400)
-
-        if not otp_obj.is_valid():
-            return Response({"error": "OTP has expired."}, status=400)
-
-        journal.delete()
+        with transaction.atomic():
+            # The OTP is consumed in the same transaction, it can't be replayed and isn't burnt if the delete fails
+            if not consume_deletion_otp(author, journal, otp_input):
+                return Response({"error": "Invalid or expired OTP."}, status=400)
+            journal.delete()
         return Response({"message": "Journal deleted successfully."}, status=204)
 
-class SubmittedJournalsAPIView(APIView):  # Endpoint to get all submitted journals
+class SubmittedJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all submitted journals
     def get(self, request, *args, **kwargs):
         # Filter journals by 'submitted' status
         submitted_journals = Journal.objects.filter(status='submitted')
-        
-        # Serialize the list of submitted journals
-        serializer = JournalSerializer(submitted_journals, many=True)
-        
-        # Return the serialized data
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, submitted_journals)
 
-class UnderReviewJournalsAPIView(APIView):  # Endpoint to get all journals under review
+class UnderReviewJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all journals under review
     def get(self, request, *args, **kwargs):
         under_review_journals = Journal.objects.filter(status='under_review')
-        serializer = JournalSerializer(under_review_journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, under_review_journals)
     
-class RevisionsRequiredJournalsAPIView(APIView):  # Endpoint to get all journals requiring revisions
+class RevisionsRequiredJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all journals requiring revisions
     def get(self, request, *args, **kwargs):
         revisions_required_journals = Journal.objects.filter(status='revisions_required')
-        serializer = JournalSerializer(revisions_required_journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, revisions_required_journals)
     
-class AcceptedJournalsAPIView(APIView):  # Endpoint to get all accepted journals
+class AcceptedJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all accepted journals
     def get(self, request, *args, **kwargs):
         accepted_journals = Journal.objects.filter(status='accepted')
-        serializer = JournalSerializer(accepted_journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, accepted_journals)
     
-class RejectedJournalsAPIView(APIView):  # Endpoint to get all rejected journals
+class RejectedJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all rejected journals
     def get(self, request, *args, **kwargs):
         rejected_journals = Journal.objects.filter(status='rejected')
-        serializer = JournalSerializer(rejected_journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, rejected_journals)
 
-class SetJournalStatusMixin: # class to change the status of the journal
+class SetJournalStatusMixin: # class to change the status of the journal through the transition graph in transitions.py
     new_status = None  # To be set by subclasses
+    authentication_classes = [JWTAuthentication, TokenAuthentication]  # only used to record who made the change
 
     def post(self, request, journal_id, *args, **kwargs):
-        journal = get_object_or_404(Journal, id=journal_id)
-        old_status = journal.status
-        journal.status = self.new_status
-        journal.save()
+        # Optional "expected_status" in the body: the change is refused if someone else moved the journal first
+        expected_status = request.data.get('expected_status')
+        try:
+            old_status = transition_journal(journal_id, self.new_status, actor=request.user, expected_status=expected_status)
+        except TransitionError as e:
+            return Response({'error': str(e), 'journal_id': journal_id, 'current_status': e.current_status}, status=e.status_code)
+
         return Response({
             'message': f'Status updated from "{old_status}" to "{self.new_status}".',
-            'journal_id': journal.id,
-            'new_status': journal.status
+            'journal_id': journal_id,
+            'new_status': self.new_status
         }, status=status.HTTP_200_OK)
 
 class SetJournalUnderReviewAPIView(SetJournalStatusMixin, APIView): #end poin to set journal status to under review
@@ -211,9 +299,267 @@ class SetJournalAcceptedAPIView(SetJournalStatusMixin, APIView): #end point to s
 class SetJournalRejectedAPIView(SetJournalStatusMixin, APIView): #end point to set journal status to rejected
     new_status = 'rejected'
 
-class NotAcceptedOrRejectedJournalsAPIView(APIView):  # Endpoint to get all journals that are not accepted or rejected
+class BulkJournalStatusAPIView(APIView): #end point to move many journals to one status at once (POST request) body {"journal_ids": [1, 2, 3], "status": "accepted", "expected_status": "under_review"} the last key is optional
+    authentication_classes = [JWTAuthentication, TokenAuthentication]  # only used to record who made the change
+    max_ids = 300
+
+    def post(self, request, *args, **kwargs):
+        raw_ids = request.data.get('journal_ids')
+        if isinstance(raw_ids, str):
+            raw_ids = [value for value in raw_ids.split(',') if value.strip()]
+        try:
+            journal_ids = list(dict.fromkeys(int(value) for value in raw_ids or []))  # drop duplicates, keep the order
+        except (TypeError, ValueError):
+            return Response({"error": "journal_ids must be a list of integer ids."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not journal_ids:
+            return Response({"error": "Pass the journal ids as journal_ids."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(journal_ids) > self.max_ids:
+            return Response({"error": f"At most {self.max_ids} journals can be changed at once."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = transition_journals(
+                journal_ids, request.data.get('status'), actor=request.user, expected_status=request.data.get('expected_status')
+            )
+        except TransitionError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+
+        updated = sum(1 for result in results.values() if result['success'])
+        return Response({
+            'updated': updated,
+            'failed': len(journal_ids) - updated,
+            'results': {str(journal_id): results[journal_id] for journal_id in journal_ids},
+        }, status=status.HTTP_200_OK)
+
+class JournalStatsAPIView(APIView): #end point to get journal counts by status, subject area and section from the rollup table (GET request)
+    def get(self, request, *args, **kwargs):
+        by_status = dict.fromkeys(JOURNAL_STATUSES, 0)
+        by_subject_area = {}
+        by_journal_section = {}
+
+        # The rollup has one row per (status, subject area, section) in use, its size doesn't depend on the number of journals
+        for row in JournalStatusRollup.objects.filter(count__gt=0):
+            by_status[row.status] = by_status.get(row.status, 0) + row.count
+            for groups, group_id in ((by_subject_area, row.subject_area_id), (by_journal_section, row.journal_section_id)):
+                group = groups.setdefault(group_id, {'total': 0, 'by_status': {}})
+                group['total'] += row.count
+                group['by_status'][row.status] = group['by_status'].get(row.status, 0) + row.count
+
+        subject_area_names = dict(SubjectArea.objects.filter(id__in=list(by_subject_area)).values_list('id', 'name'))
+        journal_section_names = dict(JournalSection.objects.filter(id__in=list(by_journal_section)).values_list('id', 'name'))
+
+        return Response({
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'by_subject_area': [
+                {'id': group_id or None, 'name': subject_area_names.get(group_id), **group}
+                for group_id, group in sorted(by_subject_area.items())
+            ],
+            'by_journal_section': [
+                {'id': group_id or None, 'name': journal_section_names.get(group_id), **group}
+                for group_id, group in sorted(by_journal_section.items())
+            ],
+        }, status=status.HTTP_200_OK)
+
+class JournalStatusHistoryAPIView(APIView): #end point to get the status history of a journal, oldest change first (GET request)
+    def get(self, request, journal_id, *args, **kwargs):
+        get_object_or_404(Journal.objects.only('id'), id=journal_id)
+        events = JournalStatusEvent.objects.filter(journal_id=journal_id).select_related('actor').order_by('created_at', 'id')
+        return Response(JournalStatusEventSerializer(events, many=True).data)
+
+class NotAcceptedOrRejectedJournalsAPIView(JournalListPaginationMixin, APIView):  # Endpoint to get all journals that are not accepted or rejected
     def get(self, request, *args, **kwargs):
         journals = Journal.objects.exclude(status__in=['accepted', 'rejected','revisions_required'])
-        serializer = JournalSerializer(journals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.paginated_response(request, journals)
+
+class JournalQueryAPIView(JournalListPaginationMixin, APIView): #end point to query journals by status / subject_area / journal_section / author / date range with per-status facet counts (GET request)
+    def get(self, request, *args, **kwargs):
+        journals = filter_journals(Journal.objects.all(), request.query_params)
+
+        # The status facet ignores the status filter itself so the dashboard can show the other tabs' counts
+        facet_journals = filter_journals(Journal.objects.all(), request.query_params, include_status=False)
+        counts = dict(facet_journals.order_by().values_list('status').annotate(count=Count('id')))
+        status_facets = {journal_status: counts.get(journal_status, 0) for journal_status in JOURNAL_STATUSES}
+
+        response = self.paginated_response(request, journals, force_pagination=True)
+        response.data['facets'] = {'status': status_facets}
+        return response
+
+class JournalExportAPIView(APIView): #end point to download journals as csv or ndjson (GET request) eg:- export/csv/?status=accepted&submitted_from=2025-01-01, same filters as query/
+    columns = [
+        ('id', 'id'),
+        ('title', 'title'),
+        ('status', 'status'),
+        ('subject_area', 'subject_area__name'),
+        ('journal_section', 'journal_section__name'),
+        ('language', 'language'),
+        ('keywords', 'keywords'),
+        ('corresponding_author_id', 'corresponding_author_id'),
+        ('author_name', 'author_name_text'),
+        ('submission_date', 'submission_date'),
+        ('manuscript_file', 'manuscript_file'),
+    ]
+
+    def get(self, request, export_format, *args, **kwargs):
+        journals = filter_journals(Journal.objects.all(), request.query_params)
+        return export_response(journals, self.columns, export_format, 'journals')
+
+class JournalSearchAPIView(APIView): #end point to search journals by title, abstract and keywords ranked by relevance (GET request) eg:- ?q=graph neural&status=submitted&subject_area=2
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Search text is required (?q=...)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        journals = filter_journals(Journal.objects.all(), request.query_params)
+        results = []
+        for journal, score in search_journals(journals, query, max(limit, 1)):
+            results.append({
+                'id': journal.id,
+                'title': journal.title,
+                'status': journal.status,
+                'subject_area': journal.subject_area_id,
+                'journal_section': journal.journal_section_id,
+                'submission_date': journal.submission_date,
+                'score': round(score, 4),
+                'highlights': {
+                    'title': highlight(journal.title, query),
+                    'abstract': highlight(journal.abstract, query, snippet_length=240),
+                    'keywords': highlight(journal.keywords, query),
+                },
+            })
+
+        return Response({'query': query, 'count': len(results), 'results': results}, status=status.HTTP_200_OK)
+
+class JournalsByKeywordAPIView(JournalListPaginationMixin, APIView): #end point to get the journals tagged with a keyword (GET request) eg:- ?keyword=machine learning
+    def get(self, request, *args, **kwargs):
+        keyword = normalize_keyword(request.query_params.get('keyword'))
+        if not keyword:
+            return Response({"error": "keyword is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        journals = filter_journals(Journal.objects.filter(keyword_links__keyword__name=keyword), request.query_params)
+        return self.paginated_response(request, journals)
+
+class KeywordFacetAPIView(APIView): #end point to get the most used keywords with their journal counts (GET request), accepts the same filters as query/
+    max_limit = 200
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.query_params.get('limit', 50)), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        journals = filter_journals(Journal.objects.all(), request.query_params)
+        keywords = (
+            Keyword.objects.filter(journal_links__journal__in=journals)
+            .values('id', 'name')
+            .annotate(count=Count('journal_links'))
+            .order_by('-count', 'name')[:limit]
+        )
+        return Response(list(keywords), status=status.HTTP_200_OK)
+
+class KeywordAutocompleteAPIView(APIView): #end point to suggest keywords starting with the typed prefix (GET request) eg:- ?prefix=mach
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        prefix = normalize_keyword(request.query_params.get('prefix'))
+        if not prefix:
+            return Response([], status=status.HTTP_200_OK)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # name__startswith is a range scan on the unique name index
+        keywords = (
+            Keyword.objects.filter(name__startswith=prefix)
+            .values('id', 'name')
+            .annotate(count=Count('journal_links'))
+            .order_by('-count', 'name')[:limit]
+        )
+        return Response(list(keywords), status=status.HTTP_200_OK)
+
+class StartChunkedUploadAPIView(APIView): #end point to start a resumable upload of a manuscript or supplementary file (POST request) body: filename, total_size, target
+    def post(self, request, author_id, *args, **kwargs):
+        author = get_object_or_404(Author, id=author_id)
+
+        filename = request.data.get('filename')
+        target = request.data.get('target', 'manuscript')
+        try:
+            total_size = int(request.data.get('total_size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'total_size is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not filename:
+            return Response({'error': 'filename is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if target not in dict(ChunkedUpload.TARGET_CHOICES):
+            return Response({'error': 'target must be manuscript or supplementary'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < total_size <= MAX_UPLOAD_SIZE:
+            return Response({'error': f'total_size must be between 1 and {MAX_UPLOAD_SIZE} bytes'}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload = ChunkedUpload.objects.create(author=author, filename=filename, total_size=total_size, target=target)
+        return Response({
+            'upload_id': upload.id,
+            'offset': upload.offset,
+            'chunk_size': CHUNK_SIZE
+        }, status=status.HTTP_201_CREATED)
+
+class ChunkedUploadAPIView(APIView): #end point to query the offset (GET/HEAD request) or append the next chunk (PATCH request) of a resumable upload
+    def get(self, request, upload_id, *args, **kwargs):
+        upload = get_object_or_404(ChunkedUpload, id=upload_id)
+        response = Response({
+            'upload_id': upload.id,
+            'offset': upload.offset,
+            'total_size': upload.total_size,
+            'status': upload.status
+        }, status=status.HTTP_200_OK)
+        response['Upload-Offset'] = str(upload.offset)
+        response['Upload-Length'] = str(upload.total_size)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def patch(self, request, upload_id, *args, **kwargs):
+        # The raw body is the chunk (Content-Type: application/offset+octet-stream), it is never parsed into request.data
+        upload = get_object_or_404(ChunkedUpload, id=upload_id)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            return Response({'error': 'Upload-Offset and Content-Length headers are required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            checksum = parse_checksum(request.headers.get('Upload-Checksum'))
+            new_offset = append_chunk(upload, request.stream, offset, length, checksum)
+        except ChunkError as e:
+            response = Response({'error': str(e), 'offset': upload.offset}, status=e.status_code)
+            response['Upload-Offset'] = str(upload.offset)
+            return response
+
+        response = Response({'offset': new_offset, 'complete': new_offset == upload.total_size}, status=status.HTTP_200_OK)
+        response['Upload-Offset'] = str(new_offset)
+        return response
+
+class CompleteChunkedUploadAPIView(APIView): #end point to attach a finished upload to the journal (POST request) optional body: sha256 of the whole file
+    def post(self, request, upload_id, journal_id, *args, **kwargs):
+        upload = get_object_or_404(ChunkedUpload, id=upload_id)
+        journal = get_object_or_404(Journal, id=journal_id, corresponding_author_id=upload.author_id)
+
+        try:
+            attach_upload(upload, journal, sha256=request.data.get('sha256'))
+        except ChunkError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+
+        return Response({
+            'message': 'Upload attached to the journal.',
+            'manuscript_file': journal.manuscript_file.url if journal.manuscript_file else None,
+            'supplementary_files': journal.supplementary_files
+        }, status=status.HTTP_200_OK)
 
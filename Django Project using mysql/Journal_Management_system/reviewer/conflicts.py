@@ -0,0 +1,179 @@
+import re
+from django.db.models import Q
+from author.models import Author
+from journal.cache import SharedIndex
+from journal.models import Journal
+from .models import Reviewer
+
+CHANGE_LOG_NAME = 'reviewer_conflicts'  # shared change log of the reviewers, authors, users and journals to reload
+# Shared mail providers say nothing about where somebody works
+PUBLIC_EMAIL_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.co.in', 'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'icloud.com', 'me.com', 'aol.com', 'protonmail.com', 'proton.me', 'gmx.com', 'yandex.com', 'zoho.com',
+    'mail.com', 'qq.com', '163.com', 'rediffmail.com',
+}
+CONFLICT_MESSAGES = {
+    'author': "the reviewer is an author of this manuscript",
+    'co_author': "the reviewer has co-authored with an author of this manuscript",
+    'institution': "the reviewer shares an institution with an author of this manuscript",
+    'email_domain': "the reviewer shares an email domain with an author of this manuscript",
+}
+
+def normalize_institution(institution):
+    words = re.sub(r'[^\w]+', ' ', (institution or '').casefold()).split()
+    return ' '.join(words) or None
+
+def get_email_domain(email):
+    domain = (email or '').rpartition('@')[2].strip().lower()
+    return domain if domain and domain not in PUBLIC_EMAIL_DOMAINS else None
+
+def get_profile(institution, email): #the keys a person brings into a conflict: normalized institution, work email domain, lowercased email
+    return normalize_institution(institution), get_email_domain(email), (email or '').strip().lower() or None
+
+class ConflictIndex(SharedIndex): #reviewer and author profiles plus the authorship graph kept in memory, so a conflict check is a few set operations
+    change_log_name = CHANGE_LOG_NAME
+
+    def __init__(self):
+        super().__init__()
+        self.reviewers = {}  # reviewer_id -> (institution, email domain, email)
+        self.authors = {}  # author_id -> (institution, email domain, email)
+        self.authors_by_email = {}  # email -> author_id, a reviewer is linked to their author account by email
+        self.corresponding_authors = {}  # journal_id -> author_id
+        self.co_authors = {}  # journal_id -> set of author_ids
+        self.author_journals = {}  # author_id -> set of journal_ids
+
+    def load_all(self):
+        self.reviewers.clear()
+        self.authors.clear()
+        self.authors_by_email.clear()
+        self.corresponding_authors.clear()
+        self.co_authors.clear()
+        self.author_journals.clear()
+
+        for reviewer_id, institution, email in Reviewer.objects.values_list('id', 'institution', 'user__email'):
+            self.reviewers[reviewer_id] = get_profile(institution, email)
+        for author_id, institution, email in Author.objects.values_list('id', 'institution', 'user__email'):
+            self._set_author(author_id, get_profile(institution, email))
+        for journal_id, author_id in Journal.objects.values_list('id', 'corresponding_author_id'):
+            self.corresponding_authors[journal_id] = author_id
+            self.author_journals.setdefault(author_id, set()).add(journal_id)
+        for journal_id, author_id in Journal.co_authors.through.objects.values_list('journal_id', 'author_id'):
+            self.co_authors.setdefault(journal_id, set()).add(author_id)
+            self.author_journals.setdefault(author_id, set()).add(journal_id)
+
+    def refresh(self, entities): #reloads the changed ('reviewer' | 'author' | 'user' | 'journal', id) entities from the database
+        ids = {'reviewer': set(), 'author': set(), 'user': set(), 'journal': set()}
+        for kind, entity_id in entities:
+            ids[kind].add(entity_id)
+
+        if ids['reviewer'] or ids['user']:
+            rows = Reviewer.objects.filter(Q(id__in=ids['reviewer']) | Q(user_id__in=ids['user'])).values_list('id', 'institution', 'user__email')
+            for reviewer_id in ids['reviewer']:
+                self.reviewers.pop(reviewer_id, None)  # deleted reviewers are not in the rows
+            for reviewer_id, institution, email in rows:
+                self.reviewers[reviewer_id] = get_profile(institution, email)
+
+        if ids['author'] or ids['user']:
+            rows = Author.objects.filter(Q(id__in=ids['author']) | Q(user_id__in=ids['user'])).values_list('id', 'institution', 'user__email')
+            for author_id in ids['author']:
+                self._remove_author(author_id)
+            for author_id, institution, email in rows:
+                self._set_author(author_id, get_profile(institution, email))
+
+        if ids['journal']:
+            corresponding = dict(Journal.objects.filter(id__in=ids['journal']).values_list('id', 'corresponding_author_id'))
+            co_authors = {}
+            for journal_id, author_id in Journal.co_authors.through.objects.filter(journal_id__in=ids['journal']).values_list('journal_id', 'author_id'):
+                co_authors.setdefault(journal_id, set()).add(author_id)
+            for journal_id in ids['journal']:
+                self._unlink_journal(journal_id)
+                if journal_id in corresponding:
+                    self._link_journal(journal_id, corresponding[journal_id], co_authors.get(journal_id, ()))
+
+    def _remove_author(self, author_id):
+        profile = self.authors.pop(author_id, None)
+        if profile and self.authors_by_email.get(profile[2]) == author_id:
+            del self.authors_by_email[profile[2]]
+
+    def _set_author(self, author_id, profile):
+        self._remove_author(author_id)
+        self.authors[author_id] = profile
+        if profile[2]:
+            self.authors_by_email[profile[2]] = author_id
+
+    def _unlink_journal(self, journal_id):
+        for author_id in self.get_journal_authors(journal_id):
+            journals = self.author_journals.get(author_id)
+            if journals:
+                journals.discard(journal_id)
+        self.corresponding_authors.pop(journal_id, None)
+        self.co_authors.pop(journal_id, None)
+
+    def _link_journal(self, journal_id, corresponding_author_id, co_author_ids):
+        self.corresponding_authors[journal_id] = corresponding_author_id
+        self.co_authors[journal_id] = set(co_author_ids)
+        for author_id in self.get_journal_authors(journal_id):
+            self.author_journals.setdefault(author_id, set()).add(journal_id)
+
+    def journal_saved(self, journal): #most journal saves don't touch the authors, those are not broadcast
+        with self.lock:
+            if self.built and self.corresponding_authors.get(journal.id) == journal.corresponding_author_id:
+                return
+        self.notify(('journal', journal.id))
+
+    def get_journal_authors(self, journal_id):
+        authors = set(self.co_authors.get(journal_id, ()))
+        if self.corresponding_authors.get(journal_id) is not None:
+            authors.add(self.corresponding_authors[journal_id])
+        return authors
+
+    def get_collaborators(self, author_id): #everybody the author has written a manuscript with
+        collaborators = set()
+        for journal_id in self.author_journals.get(author_id, ()):
+            collaborators |= self.get_journal_authors(journal_id)
+        collaborators.discard(author_id)
+        return collaborators
+
+    def load_missing(self, journal_id, reviewer_ids): #rows created since the last sync that the change log didn't deliver are read from the database
+        missing = [('reviewer', reviewer_id) for reviewer_id in reviewer_ids if reviewer_id not in self.reviewers]
+        if journal_id not in self.corresponding_authors:
+            missing.append(('journal', journal_id))
+        if missing:
+            self.refresh(missing)
+        missing_authors = [('author', author_id) for author_id in self.get_journal_authors(journal_id) if author_id not in self.authors]
+        if missing_authors:
+            self.refresh(missing_authors)
+
+    def get_conflicts(self, journal_id, reviewer_ids): #returns {reviewer_id: [conflict kinds]} for the conflicted reviewers only
+        self.ensure_current()
+        with self.lock:
+            self.load_missing(journal_id, reviewer_ids)
+            authors = self.get_journal_authors(journal_id)
+            profiles = [self.authors[author_id] for author_id in authors if author_id in self.authors]
+            institutions = {profile[0] for profile in profiles} - {None}
+            domains = {profile[1] for profile in profiles} - {None}
+
+            conflicts = {}
+            for reviewer_id in reviewer_ids:
+                profile = self.reviewers.get(reviewer_id)
+                if profile is None:
+                    continue
+                institution, domain, email = profile
+                author_id = self.authors_by_email.get(email)
+                kinds = []
+                if author_id in authors:
+                    kinds.append('author')
+                elif author_id is not None and self.get_collaborators(author_id) & authors:
+                    kinds.append('co_author')
+                if institution in institutions:
+                    kinds.append('institution')
+                if domain in domains:
+                    kinds.append('email_domain')
+                if kinds:
+                    conflicts[reviewer_id] = kinds
+            return conflicts
+
+conflict_index = ConflictIndex()
+
+def describe_conflicts(kinds):
+    return "Conflict of interest: " + "; ".join(CONFLICT_MESSAGES[kind] for kind in kinds) + "."
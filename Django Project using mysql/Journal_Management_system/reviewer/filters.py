@@ -0,0 +1,94 @@
+from rest_framework.exceptions import ValidationError
+from journal.filters import get_multi_values, get_id_values, parse_date_param
+from .models import Reviewer, ReviewerAssignmentHistory, ReviewFeedback
+
+ASSIGNMENT_STATUSES = [choice[0] for choice in ReviewerAssignmentHistory.STATUS_CHOICES]
+RECOMMENDATIONS = [choice[0] for choice in ReviewFeedback._meta.get_field('recommendation').choices]
+
+def get_choice_values(query_params, key, choices): #multi-value param restricted to the field's choices
+    values = get_multi_values(query_params, key)
+    invalid = [value for value in values if value not in choices]
+    if invalid:
+        raise ValidationError({key: f"Unknown {key}: {', '.join(invalid)}."})
+    return values
+
+def get_bool_param(query_params, key): #None when the param is absent
+    raw = query_params.get(key)
+    if raw is None or raw == '':
+        return None
+    if raw.lower() in ('1', 'true', 'yes'):
+        return True
+    if raw.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValidationError({key: "Expected true or false."})
+
+def filter_reviewers(reviewers, query_params): #applies the is_approved / is_active / subject_area / institution filters of the reviewer list end points
+    is_approved = get_bool_param(query_params, 'is_approved')
+    if is_approved is not None:
+        reviewers = reviewers.filter(is_approved=is_approved)
+
+    is_active = get_bool_param(query_params, 'is_active')
+    if is_active is not None:
+        reviewers = reviewers.filter(is_active=is_active)
+
+    subject_areas = get_id_values(query_params, 'subject_area')
+    if subject_areas:
+        # Subquery on the link table instead of a join, so a reviewer with several matching areas is listed once
+        linked = Reviewer.subject_areas.through.objects.filter(subjectarea_id__in=subject_areas).values('reviewer_id')
+        reviewers = reviewers.filter(id__in=linked)
+
+    institution = (query_params.get('institution') or '').strip()
+    if institution:
+        reviewers = reviewers.filter(institution__icontains=institution)
+
+    return reviewers
+
+def filter_assignments(assignments, query_params): #applies the status / reviewer / journal / subject_area / assigned date range filters of the assignment end points
+    statuses = get_choice_values(query_params, 'status', ASSIGNMENT_STATUSES)
+    if statuses:
+        assignments = assignments.filter(status__in=statuses)
+
+    reviewers = get_id_values(query_params, 'reviewer')
+    if reviewers:
+        assignments = assignments.filter(reviewer_id__in=reviewers)
+
+    journals = get_id_values(query_params, 'journal')
+    if journals:
+        assignments = assignments.filter(journal_id__in=journals)
+
+    subject_areas = get_id_values(query_params, 'subject_area')
+    if subject_areas:
+        assignments = assignments.filter(subject_area_id__in=subject_areas)
+
+    assigned_from = parse_date_param(query_params, 'assigned_from')
+    if assigned_from:
+        assignments = assignments.filter(assigned_date__gte=assigned_from)
+
+    assigned_to = parse_date_param(query_params, 'assigned_to', end_of_day=True)
+    if assigned_to:
+        assignments = assignments.filter(assigned_date__lt=assigned_to)
+
+    return assignments
+
+def filter_feedback(feedbacks, query_params): #applies the reviewer / journal / recommendation / review date range filters of the feedback end points
+    reviewers = get_id_values(query_params, 'reviewer')
+    if reviewers:
+        feedbacks = feedbacks.filter(reviewer_id__in=reviewers)
+
+    journals = get_id_values(query_params, 'journal')
+    if journals:
+        feedbacks = feedbacks.filter(journal_id__in=journals)
+
+    recommendations = get_choice_values(query_params, 'recommendation', RECOMMENDATIONS)
+    if recommendations:
+        feedbacks = feedbacks.filter(recommendation__in=recommendations)
+
+    reviewed_from = parse_date_param(query_params, 'reviewed_from')
+    if reviewed_from:
+        feedbacks = feedbacks.filter(review_date__gte=reviewed_from)
+
+    reviewed_to = parse_date_param(query_params, 'reviewed_to', end_of_day=True)
+    if reviewed_to:
+        feedbacks = feedbacks.filter(review_date__lt=reviewed_to)
+
+    return feedbacks
@@ -0,0 +1,200 @@
+import math
+from collections import Counter
+import numpy as np
+from django.db.models import Count, Q
+from journal.cache import SharedIndex
+from journal.search import tokenize
+from .models import Reviewer, ReviewerAssignmentHistory
+from .conflicts import conflict_index
+
+# Weight of every manuscript field in the query vector
+QUERY_FIELD_WEIGHTS = {'title': 2.0, 'keywords': 2.0, 'abstract': 1.0}
+SUBJECT_AREA_BONUS = 0.15  # added to the similarity of reviewers registered for the manuscript's subject area
+LOAD_PENALTY = 0.25  # every open assignment divides the score by (1 + LOAD_PENALTY * open assignments)
+CANDIDATE_POOL = 200  # most similar reviewers whose load and history are looked up
+CHANGE_LOG_NAME = 'reviewer_vectors'  # shared change log of the reviewers whose vectors must be reloaded
+
+def get_term_counts(text):
+    return Counter(tokenize(text))
+
+class ReviewerMatcher(SharedIndex): #TF-IDF vectors of the reviewers' research interests kept as per-term NumPy posting arrays
+    change_log_name = CHANGE_LOG_NAME
+
+    def __init__(self):
+        super().__init__()
+        self.postings = {}  # term -> (reviewer rows int32 array, sublinear term frequencies float32 array)
+        self.row_terms = {}  # row -> terms of that reviewer, needed to remove it again
+        self.rows = {}  # reviewer_id -> row
+        self.reviewer_ids = np.zeros(0, dtype=np.int64)  # row -> reviewer_id, 0 for freed rows
+        self.free_rows = []
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.norms_dirty = True
+
+    def load_all(self):
+        self.postings.clear()
+        self.row_terms.clear()
+        self.rows.clear()
+        self.free_rows = []
+        reviewers = list(Reviewer.objects.filter(is_approved=True, is_active=True).values_list('id', 'research_interests'))
+        self.reviewer_ids = np.zeros(len(reviewers), dtype=np.int64)
+
+        term_rows = {}
+        for row, (reviewer_id, research_interests) in enumerate(reviewers):
+            counts = get_term_counts(research_interests)
+            self.rows[reviewer_id] = row
+            self.reviewer_ids[row] = reviewer_id
+            self.row_terms[row] = set(counts)
+            for term, count in counts.items():
+                term_rows.setdefault(term, ([], []))
+                term_rows[term][0].append(row)
+                term_rows[term][1].append(1 + math.log(count))
+
+        self.postings = {
+            term: (np.array(rows, dtype=np.int32), np.array(frequencies, dtype=np.float32))
+            for term, (rows, frequencies) in term_rows.items()
+        }
+        self.norms_dirty = True
+
+    def refresh(self, reviewer_ids): #reloads the vectors of the changed reviewers only, other rows are untouched
+        matchable = dict(
+            Reviewer.objects.filter(id__in=reviewer_ids, is_approved=True, is_active=True).values_list('id', 'research_interests')
+        )
+        for reviewer_id in reviewer_ids:
+            self._remove(reviewer_id)
+            if reviewer_id in matchable:
+                self._add(reviewer_id, matchable[reviewer_id])
+        self.norms_dirty = True
+
+    def _remove(self, reviewer_id):
+        row = self.rows.pop(reviewer_id, None)
+        if row is None:
+            return
+        for term in self.row_terms.pop(row, ()):
+            rows, frequencies = self.postings[term]
+            keep = rows != row
+            if keep.any():
+                self.postings[term] = (rows[keep], frequencies[keep])
+            else:
+                del self.postings[term]
+        self.reviewer_ids[row] = 0
+        self.free_rows.append(row)
+
+    def _add(self, reviewer_id, research_interests):
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            row = len(self.reviewer_ids)
+            self.reviewer_ids = np.append(self.reviewer_ids, np.int64(0))
+        self.rows[reviewer_id] = row
+        self.reviewer_ids[row] = reviewer_id
+
+        counts = get_term_counts(research_interests)
+        self.row_terms[row] = set(counts)
+        for term, count in counts.items():
+            rows, frequencies = self.postings.get(term, (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)))
+            self.postings[term] = (np.append(rows, np.int32(row)), np.append(frequencies, np.float32(1 + math.log(count))))
+
+    def update(self, reviewer): #approval, activation and research interest changes
+        self.notify(reviewer.id)
+
+    def delete(self, reviewer_id):
+        self.notify(reviewer_id)
+
+    def get_idf(self, document_frequency):
+        total = len(self.rows)
+        return math.log((1 + total) / (1 + document_frequency)) + 1  # smoothed idf, never zero
+
+    def _refresh_norms(self): #the idf of every term moves with the number of reviewers, so the norms are recomputed after changes
+        norms = np.zeros(len(self.reviewer_ids), dtype=np.float32)
+        for rows, frequencies in self.postings.values():
+            idf = self.get_idf(len(rows))
+            np.add.at(norms, rows, (frequencies * idf) ** 2)
+        self.norms = np.sqrt(norms)
+        self.norms_dirty = False
+
+    def similarities(self, journal): #cosine similarity between the manuscript and every reviewer, returns {reviewer_id: similarity} for the non-zero ones
+        self.ensure_current()  # first use, or reviewers changed in this or another process
+
+        query = Counter()
+        for field, weight in QUERY_FIELD_WEIGHTS.items():
+            for term, count in get_term_counts(getattr(journal, field)).items():
+                query[term] += weight * count
+
+        with self.lock:
+            if self.norms_dirty:
+                self._refresh_norms()
+            if not self.rows:
+                return {}
+
+            scores = np.zeros(len(self.reviewer_ids), dtype=np.float32)
+            query_norm = 0.0
+            for term, count in query.items():
+                rows, frequencies = self.postings.get(term, (None, None))
+                idf = self.get_idf(0 if rows is None else len(rows))
+                query_weight = (1 + math.log(count)) * idf
+                query_norm += query_weight ** 2  # terms no reviewer uses still lower the similarity
+                if rows is not None:
+                    scores[rows] += query_weight * frequencies * idf
+
+            if not query_norm:
+                return {}
+            matched = np.nonzero(scores)[0]
+            similarities = scores[matched] / (self.norms[matched] * math.sqrt(query_norm))
+            return dict(zip(self.reviewer_ids[matched].tolist(), similarities.tolist()))
+
+reviewer_matcher = ReviewerMatcher()
+
+def get_assignment_stats(reviewer_ids): #open load and past outcomes of the candidates in one GROUP BY
+    rows = (
+        ReviewerAssignmentHistory.objects.filter(reviewer_id__in=reviewer_ids)
+        .values('reviewer_id')
+        .annotate(
+            open=Count('id', filter=Q(status='assigned')),
+            completed=Count('id', filter=Q(status='completed')),
+            rejected=Count('id', filter=Q(status='rejected')),
+        )
+        .order_by()
+    )
+    return {row['reviewer_id']: row for row in rows}
+
+def rank_reviewers(journal, limit=20): #returns [(reviewer_id, score, details)] best match first
+    similarities = reviewer_matcher.similarities(journal)
+
+    # Reviewers registered for the subject area count as candidates even without overlapping interests
+    area_reviewers = set()
+    if journal.subject_area_id:
+        area_reviewers = set(
+            Reviewer.objects.filter(subject_areas=journal.subject_area_id, is_approved=True, is_active=True).values_list('id', flat=True)
+        )
+
+    expertise = {reviewer_id: similarities.get(reviewer_id, 0.0) for reviewer_id in set(similarities) | area_reviewers}
+    for reviewer_id in area_reviewers:
+        expertise[reviewer_id] += SUBJECT_AREA_BONUS
+
+    # Reviewers already on this manuscript or with a conflict of interest are not suggested
+    excluded = set(
+        ReviewerAssignmentHistory.objects.filter(journal=journal, status__in=['assigned', 'completed']).values_list('reviewer_id', flat=True)
+    )
+    excluded.update(conflict_index.get_conflicts(journal.id, expertise))
+    candidates = sorted((reviewer_id for reviewer_id in expertise if reviewer_id not in excluded), key=lambda reviewer_id: -expertise[reviewer_id])
+    candidates = candidates[:max(CANDIDATE_POOL, limit)]
+    stats = get_assignment_stats(candidates)
+
+    ranked = []
+    for reviewer_id in candidates:
+        history = stats.get(reviewer_id, {})
+        open_assignments = history.get('open', 0)
+        completed = history.get('completed', 0)
+        rejected = history.get('rejected', 0)
+        reliability = (completed + 1) / (completed + rejected + 2)  # Laplace smoothed completion rate, 0.5 for new reviewers
+        score = expertise[reviewer_id] / (1 + LOAD_PENALTY * open_assignments) * (0.5 + reliability)
+        ranked.append((reviewer_id, score, {
+            'similarity': round(similarities.get(reviewer_id, 0.0), 4),
+            'subject_area_match': reviewer_id in area_reviewers,
+            'open_assignments': open_assignments,
+            'completed_reviews': completed,
+            'rejected_reviews': rejected,
+        }))
+
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:19
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def reject_duplicate_assignments(apps, schema_editor):
+    # Rows created by the old racy check-then-create would violate the new constraint. The completed
+    # (or else the newest) assignment of each journal and reviewer is kept, the others are marked rejected.
+    ReviewerAssignmentHistory = apps.get_model('reviewer', 'ReviewerAssignmentHistory')
+    active = ReviewerAssignmentHistory.objects.filter(status__in=['assigned', 'completed'])
+    duplicates = active.values('journal_id', 'reviewer_id').annotate(count=Count('id')).filter(count__gt=1).order_by()
+    for duplicate in duplicates:
+        rows = list(active.filter(journal_id=duplicate['journal_id'], reviewer_id=duplicate['reviewer_id']).order_by('-assigned_date', '-id'))
+        keep = next((row for row in rows if row.status == 'completed'), rows[0])
+        ReviewerAssignmentHistory.objects.filter(id__in=[row.id for row in rows if row.id != keep.id]).update(
+            status='rejected', rejection_reason='Duplicate assignment removed by migration.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0015_journalstatusrollup'),
+        ('reviewer', '0005_alter_educationdetailofreviewer_end_year_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_duplicate_assignments, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='reviewerassignmenthistory',
+            name='active',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status__in=['assigned', 'completed'], then=models.Value(True)), default=None), output_field=models.BooleanField(null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['journal', 'reviewer', 'status'], name='assignment_journal_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['reviewer', 'status'], name='assignment_reviewer_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewerassignmenthistory',
+            constraint=models.UniqueConstraint(fields=('journal', 'reviewer', 'active'), name='unique_active_reviewer_assignment'),
+        ),
+    ]
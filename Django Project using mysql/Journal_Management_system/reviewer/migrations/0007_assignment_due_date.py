@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:23
+
+import reviewer.models
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_existing_due_dates(apps, schema_editor):
+    # Existing rows got the migration time as default, their deadline is counted from the assignment instead
+    ReviewerAssignmentHistory = apps.get_model('reviewer', 'ReviewerAssignmentHistory')
+    ReviewerAssignmentHistory.objects.update(due_date=F('assigned_date') + timedelta(days=21))  # reviewer.models.REVIEW_PERIOD at the time of writing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0015_journalstatusrollup'),
+        ('reviewer', '0006_assignment_active_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewerassignmenthistory',
+            name='due_date',
+            field=models.DateTimeField(blank=True, default=reviewer.models.get_review_due_date, null=True),
+        ),
+        migrations.AddField(
+            model_name='reviewerassignmenthistory',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_existing_due_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['status', 'due_date'], name='assignment_status_due_idx'),
+        ),
+    ]
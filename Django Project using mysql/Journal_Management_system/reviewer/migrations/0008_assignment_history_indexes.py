@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0015_journalstatusrollup'),
+        ('reviewer', '0007_assignment_due_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['assigned_date', 'id'], name='assignment_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['status', 'assigned_date', 'id'], name='assignment_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewerassignmenthistory',
+            index=models.Index(fields=['subject_area', 'assigned_date', 'id'], name='assignment_area_date_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from datetime import timedelta
 from django.db import models
+from django.db.models import Case, Value, When
+from django.utils import timezone
 from django.contrib.auth.models import User
 from journal.models import SubjectArea,Journal  # Assuming you already have this model
 # Create your models here.
@@ -50,7 +53,14 @@ class EducationDetailOfReviewer(models.Model):
     def __str__(self):
         return f"{self.degree} in {self.field_of_study} from {self.institution}"
 
+REVIEW_PERIOD = timedelta(days=21)  # time a reviewer gets for a manuscript
+
+def get_review_due_date():
+    return timezone.now() + REVIEW_PERIOD
+
 class ReviewerAssignmentHistory(models.Model):
+    OPEN_STATUSES = ['assigned']  # statuses the overdue sweeper reminds about
+    ACTIVE_STATUSES = ['assigned', 'completed']  # a reviewer can be assigned to a journal again only after rejecting it
     STATUS_CHOICES = [
         ('assigned', 'Assigned'),
         ('completed', 'Completed'),
@@ -62,8 +72,32 @@ class ReviewerAssignmentHistory(models.Model):
     subject_area = models.ForeignKey(SubjectArea, on_delete=models.SET_NULL, null=True, blank=True)
     assigned_date = models.DateTimeField(auto_now_add=True)
     completed_date = models.DateTimeField(null=True, blank=True)
+    due_date = models.DateTimeField(default=get_review_due_date, null=True, blank=True)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)  # set by the overdue sweeper so every assignment is reminded once
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='assigned')
     rejection_reason = models.TextField(null=True, blank=True)
+    # True while the assignment is assigned or completed, NULL once rejected. The database computes it, and since NULLs
+    # never collide in a unique index it makes "one active assignment per journal and reviewer" enforceable on MySQL,
+    # which ignores conditional unique constraints.
+    active = models.GeneratedField(
+        expression=Case(When(status__in=ACTIVE_STATUSES, then=Value(True)), default=None),
+        output_field=models.BooleanField(null=True),
+        db_persist=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['journal', 'reviewer', 'active'], name='unique_active_reviewer_assignment'),
+        ]
+        indexes = [
+            models.Index(fields=['journal', 'reviewer', 'status'], name='assignment_journal_rev_idx'),  # assign, reject and feedback lookups
+            models.Index(fields=['reviewer', 'status'], name='assignment_reviewer_status_idx'),  # a reviewer's open assignments
+            models.Index(fields=['status', 'due_date'], name='assignment_status_due_idx'),  # overdue sweeper range scans
+            # The assignment history pages walk (assigned_date, id), alone or within one status or subject area
+            models.Index(fields=['assigned_date', 'id'], name='assignment_date_idx'),
+            models.Index(fields=['status', 'assigned_date', 'id'], name='assignment_status_date_idx'),
+            models.Index(fields=['subject_area', 'assigned_date', 'id'], name='assignment_area_date_idx'),
+        ]
 
     def __str__(self):
         return f"Reviewer {self.reviewer.user.first_name} {self.reviewer.user.last_name} assigned to '{self.journal.title}'"
@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+class ReviewerCursorPagination(CursorPagination): #keyset (cursor) pagination for the reviewer list end points, newest reviewers first
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-date_joined', '-id')
+
+class AssignmentHistoryCursorPagination(CursorPagination): #keyset (cursor) pagination for the assignment history, newest assignments first
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-assigned_date', '-id')
@@ -14,6 +14,9 @@ from .models import ReviewFeedback
 from .models import ReviewerAssignmentHistory
 from journal.models import Journal
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from journal.serializers import NestedJSONListSerializer
+from journal.sync import sync_child_rows, EDUCATION_MATCH_FIELDS, EDUCATION_UPDATE_FIELDS
+from django.db import transaction
 
 class ReviewerRegistrationSerializer(serializers.ModelSerializer): #serializer for registration of the reviewer
     first_name = serializers.CharField(write_only=True)
@@ -169,9 +172,12 @@ class ReviewerUpdateSerializer(serializers.ModelSerializer):
         return instance'''
 
 class EducationSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)  # optional, lets the client point at the row it edits
+
     class Meta:
         model = EducationDetailOfReviewer
-        fields = ['degree', 'field_of_study', 'institution', 'start_year', 'end_year', 'grade_or_score']
+        fields = ['id', 'degree', 'field_of_study', 'institution', 'start_year', 'end_year', 'grade_or_score']
+        list_serializer_class = NestedJSONListSerializer
 
 '''class ReviewerUpdateSerializer(serializers.ModelSerializer):
     educations = EducationSerializer(many=True, required=False)
@@ -213,6 +219,7 @@ class ReviewerUpdateSerializer(serializers.ModelSerializer):
                  'personal_website', 'languages_spoken', 'subject_areas', 'educations',
                  'profile_picture', 'resume']
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         educations_data = validated_data.pop('educations', None)
         subject_areas_data = validated_data.pop('subject_areas', None)
@@ -227,14 +234,12 @@ class ReviewerUpdateSerializer(serializers.ModelSerializer):
         
         instance.save()
         
-        # Handle educations
+        # Handle educations, only the rows that changed are written
         if educations_data is not None:
-            # Clear existing educations
-            instance.educations.all().delete()
-            
-            # Create new educations
-            for education_data in educations_data:
-                EducationDetailOfReviewer.objects.create(reviewer=instance, **education_data)
+            sync_child_rows(
+                instance.educations.all(), EducationDetailOfReviewer, 'reviewer', instance, educations_data,
+                match_fields=EDUCATION_MATCH_FIELDS, update_fields=EDUCATION_UPDATE_FIELDS
+            )
         
         return instance
 
@@ -323,6 +328,7 @@ class ReviewerAssignmentHistorySerializer(serializers.ModelSerializer):
             'subject_area_name',
             'assigned_date',
             'completed_date',
+            'due_date',
             'status',
             'rejection_reason',
             'reviewer_name',
@@ -418,4 +424,17 @@ class ReviewerTokenObtainPairSerializer(TokenObtainPairSerializer):
             'last_name': valid_user.last_name,
             'is_approved': valid_user.reviewer.is_approved,
             'token': str(refresh.access_token)
-        }
\ No newline at end of file
+        }
+
+class RankedReviewerSerializer(ReviewerSerializer): #serializer for the reviewer suggestions of a manuscript, score and its parts come from the context
+    score = serializers.SerializerMethodField()
+    match = serializers.SerializerMethodField()
+
+    class Meta(ReviewerSerializer.Meta):
+        fields = ReviewerSerializer.Meta.fields + ['research_interests', 'score', 'match']
+
+    def get_score(self, obj):
+        return round(self.context['scores'][obj.id], 4)
+
+    def get_match(self, obj):
+        return self.context['details'][obj.id]
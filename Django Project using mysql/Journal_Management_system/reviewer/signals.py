@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from author.models import Author
+from journal.models import Journal
+from .models import Reviewer, ReviewFeedback, ReviewerAssignmentHistory
+from .matching import reviewer_matcher
+from .conflicts import conflict_index
+from .summary import invalidate_review_summary
+
+MATCHING_FIELDS = {'research_interests', 'is_approved', 'is_active'}
+
+@receiver(post_save, sender=Reviewer)
+def update_reviewer_vector(sender, instance, update_fields=None, **kwargs): #approval, activation and research interest changes all go through save()
+    if update_fields is None or MATCHING_FIELDS & set(update_fields):
+        reviewer_matcher.update(instance)
+    conflict_index.notify(('reviewer', instance.id))
+
+@receiver(post_delete, sender=Reviewer)
+def remove_reviewer_vector(sender, instance, **kwargs):
+    reviewer_matcher.delete(instance.id)
+    conflict_index.notify(('reviewer', instance.id))
+
+@receiver([post_save, post_delete], sender=Author)
+def update_author_conflicts(sender, instance, **kwargs):
+    conflict_index.notify(('author', instance.id))
+
+@receiver(post_save, sender=User)
+def update_user_conflicts(sender, instance, update_fields=None, **kwargs): #logins save last_login only, those are skipped
+    if update_fields is None or 'email' in update_fields:
+        conflict_index.notify(('user', instance.id))
+
+@receiver(post_save, sender=Journal)
+def update_journal_conflicts(sender, instance, **kwargs):
+    conflict_index.journal_saved(instance)
+
+@receiver(post_delete, sender=Journal)
+def remove_journal_conflicts(sender, instance, **kwargs):
+    conflict_index.notify(('journal', instance.id))
+
+@receiver(m2m_changed, sender=Journal.co_authors.through)
+def update_co_author_conflicts(sender, instance, action, reverse, pk_set, **kwargs): #journal.co_authors and author.coauthored_journals both end up here
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        conflict_index.notify(('journal', instance.id))
+    elif reverse and action in ('post_add', 'post_remove'):
+        conflict_index.notify(*[('journal', journal_id) for journal_id in pk_set])
+    elif reverse and action == 'pre_clear':
+        # author.coauthored_journals.clear() doesn't name the journals, they are read before the rows go
+        conflict_index.notify(*[('journal', journal_id) for journal_id in instance.coauthored_journals.values_list('id', flat=True)])
+
+@receiver([post_save, post_delete], sender=ReviewFeedback)
+@receiver([post_save, post_delete], sender=ReviewerAssignmentHistory)
+def invalidate_journal_review_summary(sender, instance, **kwargs): #bulk_create and update() skip this, those paths invalidate themselves
+    invalidate_review_summary(instance.journal_id)
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from journal.models import Journal
+from .models import ReviewFeedback, ReviewerAssignmentHistory
+
+SUMMARY_CACHE_TIMEOUT = 24 * 60 * 60  # feedback and assignment writes delete the entry, the timeout is only a safety net
+RATINGS = [choice[0] for choice in ReviewFeedback._meta.get_field('rating').choices]
+RECOMMENDATIONS = [choice[0] for choice in ReviewFeedback._meta.get_field('recommendation').choices]
+ASSIGNMENT_STATUSES = [choice[0] for choice in ReviewerAssignmentHistory.STATUS_CHOICES]
+
+def get_summary_key(journal_id):
+    return f'reviewer:review-summary:{journal_id}'
+
+def invalidate_review_summary(journal_id):
+    cache.delete(get_summary_key(journal_id))
+
+def build_review_summary(journal_id): #one query joining the journal's feedback and assignments, None when the journal doesn't exist
+    # Both reverse relations are joined at once, so every count is DISTINCT on the row id to undo the cross product
+    aggregates = {
+        'feedback_count': Count('reviewfeedback', distinct=True),
+        'final_feedback_count': Count('reviewfeedback', filter=Q(reviewfeedback__is_final_submission=True), distinct=True),
+        'latest_review_date': Max('reviewfeedback__review_date'),
+        'latest_feedback_update': Max('reviewfeedback__updated_at'),
+        'latest_completed_date': Max('reviewerassignmenthistory__completed_date'),
+    }
+    for rating in RATINGS:
+        aggregates[f'rating_{rating}'] = Count('reviewfeedback', filter=Q(reviewfeedback__rating=rating), distinct=True)
+    for recommendation in RECOMMENDATIONS:
+        aggregates[f'recommendation_{recommendation}'] = Count(
+            'reviewfeedback', filter=Q(reviewfeedback__recommendation=recommendation), distinct=True
+        )
+    for assignment_status in ASSIGNMENT_STATUSES:
+        aggregates[f'assignments_{assignment_status}'] = Count(
+            'reviewerassignmenthistory', filter=Q(reviewerassignmenthistory__status=assignment_status), distinct=True
+        )
+
+    row = Journal.objects.filter(id=journal_id).values('id').annotate(**aggregates).first()
+    if row is None:
+        return None
+
+    distribution = {str(rating): row[f'rating_{rating}'] for rating in RATINGS}
+    rated = sum(distribution.values())
+    assignments = {assignment_status: row[f'assignments_{assignment_status}'] for assignment_status in ASSIGNMENT_STATUSES}
+
+    return {
+        'journal_id': journal_id,
+        'feedback_count': row['feedback_count'],
+        'final_feedback_count': row['final_feedback_count'],
+        'rating': {
+            # The mean comes from the distribution, an AVG over the joined rows would be skewed by the cross product
+            'mean': round(sum(int(rating) * count for rating, count in distribution.items()) / rated, 2) if rated else None,
+            'distribution': distribution,
+        },
+        'recommendations': {recommendation: row[f'recommendation_{recommendation}'] for recommendation in RECOMMENDATIONS},
+        'assignments': {
+            **assignments,
+            'total': sum(assignments.values()),
+            'outstanding': assignments.get('assigned', 0),
+        },
+        'latest_review_date': row['latest_review_date'],
+        'latest_feedback_update': row['latest_feedback_update'],
+        'latest_completed_date': row['latest_completed_date'],
+    }
+
+def get_review_summary(journal_id): #cached until the journal's next feedback or assignment change
+    key = get_summary_key(journal_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_review_summary(journal_id)
+        if summary is not None:
+            cache.set(key, summary, timeout=SUMMARY_CACHE_TIMEOUT)
+    return summary
@@ -1,3 +1,329 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.base import BaseCache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from author.models import Author
+from journal.models import SubjectArea, Journal
+from .models import Reviewer, EducationDetailOfReviewer, ReviewerAssignmentHistory, ReviewFeedback
+from .matching import ReviewerMatcher
+from .conflicts import ConflictIndex
 
-# Create your tests here.
+class ReviewerListQueryCountTests(TestCase): #the reviewer lists and detail must not issue queries per reviewer
+    @classmethod
+    def setUpTestData(cls):
+        cls.areas = [SubjectArea.objects.create(name=f'Area {index}') for index in range(3)]
+        cls.reviewers = []
+        for index in range(6):
+            user = User.objects.create_user(username=f'reviewer{index}', email=f'reviewer{index}@example.org', first_name='Reviewer', last_name=str(index))
+            reviewer = Reviewer.objects.create(user=user, institution=f'Institute {index % 2}', is_approved=index % 3 != 0)
+            reviewer.subject_areas.set(cls.areas[:index % 3 + 1])
+            EducationDetailOfReviewer.objects.create(reviewer=reviewer, degree='PhD', field_of_study='Physics', institution='University')
+            EducationDetailOfReviewer.objects.create(reviewer=reviewer, degree='MSc', field_of_study='Physics', institution='University')
+            cls.reviewers.append(reviewer)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def get(self, url, queries):
+        # reviewers with user, subject areas, educations
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_all_reviewers(self):
+        data = self.get('/reviewer/all-reviewers/', 3)
+        self.assertEqual(len(data), 6)
+        self.assertEqual(len(data[0]['educations']), 2)
+
+    def test_approved_reviewers(self):
+        data = self.get('/reviewer/approved/', 3)
+        self.assertEqual({reviewer['id'] for reviewer in data}, {reviewer.id for reviewer in self.reviewers if reviewer.is_approved})
+
+    def test_unapproved_reviewers(self):
+        data = self.get('/reviewer/unapproved/', 3)
+        self.assertEqual({reviewer['id'] for reviewer in data}, {reviewer.id for reviewer in self.reviewers if not reviewer.is_approved})
+
+    def test_reviewer_detail(self):
+        data = self.get(f'/reviewer/get-profile/{self.reviewers[2].id}/', 3)
+        self.assertEqual(len(data['subject_areas']), 3)
+
+    def test_paginated_and_filtered(self):
+        data = self.get(f'/reviewer/all-reviewers/?page_size=2&subject_area={self.areas[1].id}&institution=institute', 3)
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNotNone(data['next'])
+
+        with self.assertNumQueries(3):
+            next_page = self.client.get(data['next']).data
+        ids = [reviewer['id'] for reviewer in data['results'] + next_page['results']]
+        self.assertEqual(sorted(ids), sorted(reviewer.id for reviewer in self.reviewers if reviewer.subject_areas.filter(id=self.areas[1].id).exists()))
+
+    def test_invalid_filter(self):
+        response = self.client.get('/reviewer/all-reviewers/?is_approved=maybe')
+        self.assertEqual(response.status_code, 400)
+
+class ReviewerAssignmentHistoryListTests(TestCase): #the assignment history is filtered and cursor paginated without queries per row
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = SubjectArea.objects.create(name='Area')
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='Institute', country='IN')
+        journals = [
+            Journal.objects.create(title=f'Journal {index}', abstract='x', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author)
+            for index in range(3)
+        ]
+        cls.reviewers = [
+            Reviewer.objects.create(user=User.objects.create_user(username=f'reviewer{index}', email=f'reviewer{index}@example.org'), institution=f'Institute {index}', is_approved=True)
+            for index in range(4)
+        ]
+        for journal in journals:
+            for index, reviewer in enumerate(cls.reviewers):
+                ReviewerAssignmentHistory.objects.create(
+                    journal=journal, reviewer=reviewer, subject_area=cls.area if index % 2 else None, status='completed' if index == 0 else 'assigned'
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_plain_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/reviewer/reviewer-assignments/')
+        self.assertEqual(len(response.data), 12)
+        latest = ReviewerAssignmentHistory.objects.latest('assigned_date', 'id')
+        self.assertEqual(response.data[0]['id'], latest.id)
+        self.assertEqual(response.data[0]['due_date'], latest.due_date.isoformat().replace('+00:00', 'Z'))
+
+    def test_paginated_and_filtered(self):
+        with self.assertNumQueries(1):
+            data = self.client.get(f'/reviewer/reviewer-assignments/?page_size=2&status=assigned&subject_area={self.area.id}').data
+        self.assertEqual(len(data['results']), 2)
+
+        ids = [assignment['id'] for assignment in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).data
+            ids += [assignment['id'] for assignment in data['results']]
+        expected = ReviewerAssignmentHistory.objects.filter(status='assigned', subject_area=self.area).order_by('-assigned_date', '-id')
+        self.assertEqual(ids, list(expected.values_list('id', flat=True)))
+
+    def test_reviewer_filter(self):
+        response = self.client.get(f'/reviewer/reviewer-assignments/?reviewer={self.reviewers[0].id}')
+        self.assertEqual({assignment['status'] for assignment in response.data}, {'completed'})
+        self.assertEqual(len(response.data), 3)
+
+    def test_invalid_filter(self):
+        response = self.client.get('/reviewer/reviewer-assignments/?status=lost')
+        self.assertEqual(response.status_code, 400)
+
+class ReviewerExportTests(TestCase): #the assignment and feedback exports use the list filters and escape formula cells
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='Institute', country='IN')
+        cls.journal = Journal.objects.create(title='=cmd|calc', abstract='x', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author)
+        cls.reviewers = [
+            Reviewer.objects.create(user=User.objects.create_user(username=f'reviewer{index}', email=f'reviewer{index}@example.org'), institution='Other', is_approved=True)
+            for index in range(3)
+        ]
+        for index, reviewer in enumerate(cls.reviewers):
+            ReviewerAssignmentHistory.objects.create(journal=cls.journal, reviewer=reviewer, status='completed' if index else 'assigned')
+            if index:
+                ReviewFeedback.objects.create(
+                    journal=cls.journal, reviewer=reviewer, feedback_text='+good work' if index == 1 else 'Fine',
+                    recommendation='accept' if index == 1 else 'reject',
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_assignments_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('/reviewer/assignments/export/csv/?status=completed'))))
+        self.assertEqual([int(row['reviewer_id']) for row in rows], [reviewer.id for reviewer in self.reviewers[1:]])
+        self.assertEqual({row['journal_title'] for row in rows}, {"'=cmd|calc"})
+
+    def test_feedback_ndjson(self):
+        records = [json.loads(line) for line in self.export('/reviewer/review-feedback/export/ndjson/?recommendation=accept').splitlines()]
+        self.assertEqual([record['reviewer_id'] for record in records], [self.reviewers[1].id])
+        self.assertEqual(records[0]['feedback_text'], '+good work')
+
+    def test_feedback_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('/reviewer/review-feedback/export/csv/'))))
+        self.assertEqual([row['feedback_text'] for row in rows], ["'+good work", 'Fine'])
+
+class JournalReviewSummaryTests(TestCase): #the cached review summary must follow new feedback and assignment changes
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='Institute', country='IN')
+        cls.journal = Journal.objects.create(title='Journal', abstract='x', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author)
+        cls.reviewer = Reviewer.objects.create(user=User.objects.create_user(username='reviewer', email='reviewer@example.org'), institution='Other', is_approved=True)
+        ReviewerAssignmentHistory.objects.create(journal=cls.journal, reviewer=cls.reviewer)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_summary_follows_feedback(self):
+        summary = self.client.get(f'/reviewer/review-summary/{self.journal.id}/').data
+        self.assertEqual(summary['feedback_count'], 0)
+        self.assertEqual(summary['assignments']['outstanding'], 1)
+
+        response = self.client.post(
+            f'/reviewer/review-feedback/{self.journal.id}/{self.reviewer.id}/',
+            {'feedback_text': 'Sound work.', 'rating': 4, 'recommendation': 'minor_revision'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+
+        summary = self.client.get(f'/reviewer/review-summary/{self.journal.id}/').data
+        self.assertEqual(summary['feedback_count'], 1)
+        self.assertEqual(summary['rating']['mean'], 4)
+        self.assertEqual(summary['recommendations']['minor_revision'], 1)
+        self.assertEqual(summary['assignments']['completed'], 1)
+        self.assertEqual(summary['assignments']['outstanding'], 0)
+
+    def test_missing_journal(self):
+        self.assertEqual(self.client.get('/reviewer/review-summary/999999/').status_code, 404)
+
+class ReviewerMatcherSyncTests(TestCase): #a reviewer changed by one worker process must reach the matcher of every other process
+    def setUp(self):
+        cache.clear()
+        author = Author.objects.create(user=User.objects.create_user(username='author', email='author@example.org'), institution='Institute', country='IN')
+        self.journal = Journal.objects.create(
+            title='Graph neural networks', abstract='Message passing on molecular graphs', keywords='graphs', language='en',
+            manuscript_file='journals/x.pdf', corresponding_author=author,
+        )
+        self.reviewer = Reviewer.objects.create(
+            user=User.objects.create_user(username='reviewer', email='reviewer@example.org'), institution='Other', research_interests='graph neural networks',
+        )
+
+    def test_other_process_sees_approval(self):
+        other_worker = ReviewerMatcher()  # its own in-memory index, like a second process sharing the cache
+        self.assertEqual(other_worker.similarities(self.journal), {})
+
+        self.reviewer.is_approved = True
+        self.reviewer.save()
+        with self.assertNumQueries(1):  # only the changed reviewer is reloaded, not the whole index
+            similarities = other_worker.similarities(self.journal)
+        self.assertIn(self.reviewer.id, similarities)
+
+        self.reviewer.delete()
+        self.assertEqual(other_worker.similarities(self.journal), {})
+
+    def test_unrelated_saves_are_not_broadcast(self):
+        other_worker = ReviewerMatcher()
+        other_worker.similarities(self.journal)
+        seen = other_worker.seen
+        self.reviewer.save(update_fields=['phone_number'])
+        self.assertEqual(other_worker.changes.since(seen), (seen, set()))
+
+class UnreachableCache(BaseCache): #cache server that is down, every call fails like a refused redis connection
+    def __init__(self, location, params):
+        super().__init__(params)
+
+    def fail(self, *args, **kwargs):
+        raise ConnectionError("Connection refused")
+
+    add = get = set = touch = delete = clear = incr = get_many = fail
+
+@override_settings(CACHES={'default': {'BACKEND': 'reviewer.tests.UnreachableCache'}})
+class CacheOutageTests(TestCase): #a cache outage must not fail the saves, the shared indexes fall back to rebuilding
+    def test_saves_succeed_and_indexes_rebuild(self):
+        matcher = ReviewerMatcher()
+        conflicts = ConflictIndex()
+        with self.assertLogs('journal.cache', 'ERROR'):
+            author = Author.objects.create(user=User.objects.create_user(username='author', email='author@science.org'), institution='Institute', country='IN')
+            journal = Journal.objects.create(
+                title='Graph neural networks', abstract='Message passing on molecular graphs', keywords='graphs', language='en',
+                manuscript_file='journals/x.pdf', corresponding_author=author,
+            )
+            reviewer = Reviewer.objects.create(
+                user=User.objects.create_user(username='reviewer', email='reviewer@science.org'), institution='Institute',
+                research_interests='graph neural networks', is_approved=True,
+            )
+
+        with self.assertLogs('journal.cache', 'ERROR'):
+            self.assertIn(reviewer.id, matcher.similarities(journal))
+            self.assertEqual(conflicts.get_conflicts(journal.id, [reviewer.id]), {reviewer.id: ['institution', 'email_domain']})
+
+class ConflictIndexTests(TestCase): #conflicts must be found for rows written by another worker process
+    def setUp(self):
+        cache.clear()
+        self.author = self.create_author('author', 'Institute of Science', 'author@science.org')
+        self.reviewer = Reviewer.objects.create(
+            user=User.objects.create_user(username='reviewer', email='reviewer@example.org'), institution='institute of  science', is_approved=True,
+        )
+
+    def create_author(self, username, institution, email):
+        return Author.objects.create(user=User.objects.create_user(username=username, email=email), institution=institution, country='IN')
+
+    def create_journal(self, author):
+        return Journal.objects.create(title='Journal', abstract='x', keywords='x', language='en', manuscript_file='journals/x.pdf', corresponding_author=author)
+
+    def test_changes_reach_other_process(self):
+        other_worker = ConflictIndex()
+        other_worker.ensure_current()
+        journal = self.create_journal(self.author)
+        self.assertEqual(other_worker.get_conflicts(journal.id, [self.reviewer.id]), {self.reviewer.id: ['institution']})
+
+        self.reviewer.institution = 'Elsewhere'
+        self.reviewer.save()
+        self.assertEqual(other_worker.get_conflicts(journal.id, [self.reviewer.id]), {})
+
+        # The reviewer's own author account co-wrote another manuscript with an author of this one
+        colleague = self.create_author('colleague', 'Far away', 'colleague@far.org')
+        reviewer_as_author = self.create_author('reviewer-author', 'Elsewhere 2', 'reviewer@example.org')
+        self.create_journal(colleague).co_authors.add(reviewer_as_author)
+        journal.co_authors.add(colleague)
+        self.assertEqual(other_worker.get_conflicts(journal.id, [self.reviewer.id]), {self.reviewer.id: ['co_author']})
+
+    def test_missed_changes_fall_back_to_the_database(self):
+        other_worker = ConflictIndex()
+        other_worker.ensure_current()
+        journal = self.create_journal(self.author)
+        reviewer = Reviewer.objects.create(user=User.objects.create_user(username='new', email='new@science.org'), institution='Other', is_approved=True)
+        other_worker.seen = other_worker.changes.current()  # as if the changes were recorded in a cache this process can't see
+
+        conflicts = other_worker.get_conflicts(journal.id, [self.reviewer.id, reviewer.id])
+        self.assertEqual(conflicts, {self.reviewer.id: ['institution'], reviewer.id: ['email_domain']})
+        with self.assertNumQueries(0):
+            other_worker.get_conflicts(journal.id, [self.reviewer.id, reviewer.id])
+
+class ReviewerEducationSyncTests(TestCase): #education rows are matched by id or natural key, never reused for a different entry
+    def setUp(self):
+        self.client = APIClient()
+        self.reviewer = Reviewer.objects.create(user=User.objects.create_user(username='reviewer', email='reviewer@example.org'), institution='Institute')
+        self.bsc = EducationDetailOfReviewer.objects.create(
+            reviewer=self.reviewer, degree='BSc', field_of_study='Physics', institution='University', certificate='reviewer_certificates/bsc.pdf',
+        )
+
+    def update(self, educations):
+        response = self.client.patch(f'/reviewer/update/{self.reviewer.id}/', {'educations': educations}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return list(self.reviewer.educations.order_by('id'))
+
+    def test_unrelated_row_is_not_reused(self):
+        educations = self.update([{'degree': 'MSc', 'field_of_study': 'Chemistry', 'institution': 'University'}])
+        self.assertEqual(len(educations), 1)
+        self.assertNotEqual(educations[0].id, self.bsc.id)
+        self.assertFalse(educations[0].certificate)
+
+    def test_matching_row_keeps_its_certificate(self):
+        educations = self.update([
+            {'degree': 'bsc', 'field_of_study': 'Physics', 'institution': 'University', 'start_year': 2010},
+            {'degree': 'MSc', 'field_of_study': 'Physics', 'institution': 'University'},
+        ])
+        self.assertEqual([education.id for education in educations][0], self.bsc.id)
+        self.assertEqual(educations[0].certificate.name, 'reviewer_certificates/bsc.pdf')
+        self.assertEqual(educations[0].start_year, 2010)
+
+    def test_edit_by_id_into_another_entry_drops_the_certificate(self):
+        educations = self.update([{'id': self.bsc.id, 'degree': 'MSc', 'field_of_study': 'Chemistry', 'institution': 'University'}])
+        self.assertEqual(educations[0].id, self.bsc.id)
+        self.assertEqual(educations[0].degree, 'MSc')
+        self.assertFalse(educations[0].certificate)
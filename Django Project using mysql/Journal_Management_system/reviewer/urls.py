@@ -10,7 +10,9 @@ urlpatterns = [
     path('approve/<int:reviewer_id>/', ApproveReviewerAPIView.as_view(), name='approve-reviewer'), #end point to approve the reviewer by the higher authority (PATCH request)
     path('disapprove/<int:reviewer_id>/', DisapproveReviewerAPIView.as_view(), name='disapprove-reviewer'), #end point to disapprove the reviewer by the higher authority (PATCH request)
     path('subject-area/<int:subject_area_id>/', ReviewersBySubjectAreaAPIView.as_view(), name='reviewers-by-subject-area'), #end point to get the list of all approved reviewers by subject area (GET request)
+    path('rank/<int:journal_id>/', RankReviewersForJournalAPIView.as_view(), name='rank-reviewers'), #end point to get approved reviewers ranked for a journal by expertise, current load and past completion rate (GET request)
     path('assign-reviewer/<int:reviewer_id>/<int:journal_id>/', AssignReviewerToJournalAPIView.as_view(), name='assign-reviewer'), #end point to assign the reviewer to a journal (POST request)
+    path('assign-reviewers/<int:journal_id>/', BulkAssignReviewersAPIView.as_view(), name='bulk-assign-reviewers'), #end point to assign several reviewers to a journal at once (POST request) with a result per reviewer id, each reviewer gets an email
     path('assigned-journals/<int:reviewer_id>/', ReviewerAssignedJournalsAPIView.as_view(), name='reviewer-assigned-journals'), #end point to get the list of all journals assigned to the reviewer (GET request)
     path( #end point to reject the assigned journal by the reviewer (PATCH request)
         'reject/<int:journal_id>/<int:reviewer_id>/',
@@ -21,6 +23,9 @@ urlpatterns = [
     path('approved/', ApprovedReviewerListAPIView.as_view(), name='approved-reviewer-list'),#end point to get the list of all approved reviewers
     path('unapproved/', UnApprovedReviewerListAPIView.as_view(), name='approved-reviewer-list'),#end point to get the list of all approved reviewers
     path('reviewer-assignments/', ReviewerAssignmentHistoryListView.as_view(), name='reviewer-assignments-list'),
+    path('assignments/export/<str:export_format>/', ReviewerAssignmentExportAPIView.as_view(), name='reviewer-assignments-export'), #end point to stream the filtered reviewer assignments as csv or ndjson (GET request)
+    path('review-feedback/export/<str:export_format>/', ReviewFeedbackExportAPIView.as_view(), name='review-feedback-export'), #end point to stream the filtered review feedback as csv or ndjson (GET request)
+    path('review-summary/<int:journal_id>/', JournalReviewSummaryAPIView.as_view(), name='journal-review-summary'), #end point to get the aggregated reviews of a journal: rating mean and distribution, recommendation counts, completed vs outstanding assignments (GET request)
     path('review-feedback/journal/<int:journal_id>/', review_feedback_by_journal, name='review-feedback-by-journal'),
     path('reviewer/<int:reviewer_id>/assignments/', ReviewerJournalAssignmentListView.as_view(), name='reviewer-assignments'),
     path('validate-token/', ValidateReviewerTokenView.as_view(), name='reviewer-validate-token'),
@@ -8,7 +8,8 @@ from rest_framework.exceptions import AuthenticationFailed
 from .models import *
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from journal.outbox import queue_email, queue_emails
 from django.conf import settings
 from rest_framework.status import HTTP_200_OK
 from journal.models import SubjectArea,Journal
@@ -21,12 +22,18 @@ from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.generics import ListAPIView
 from rest_framework import generics
-from django.db.models import Prefetch
+from django.db.models import Prefetch, Exists, OuterRef
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 import json
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from journal.exports import export_response
+from .filters import filter_reviewers, filter_assignments, filter_feedback
+from .pagination import ReviewerCursorPagination, AssignmentHistoryCursorPagination
+from .matching import rank_reviewers
+from .summary import get_review_summary, invalidate_review_summary
+from .conflicts import conflict_index, describe_conflicts
 
 class ReviewerRegistrationView(APIView): #end point to apply for registration as a reviewer
     def post(self, request):
@@ -79,11 +86,28 @@ class LoginView(TokenObtainPairView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class ReviewerListAPIView(APIView): #end point to get the list of all reviewers
+def get_full_reviewer_queryset(): #everything FullReviewerDetailSerializer reads, in three queries whatever the number of reviewers
+    return Reviewer.objects.select_related('user').prefetch_related('subject_areas', 'educations')
+
+class ReviewerListPaginationMixin: #class to filter the reviewer lists and paginate them with an opaque cursor when the client asks for it (?cursor= or ?page_size=)
+    pagination_class = ReviewerCursorPagination
+
+    def filtered_response(self, request, reviewers):
+        reviewers = filter_reviewers(reviewers, request.query_params)
+
+        # The frontends read the plain list, paginated clients opt in
+        if 'cursor' not in request.query_params and 'page_size' not in request.query_params:
+            serializer = FullReviewerDetailSerializer(reviewers, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(reviewers, request, view=self)
+        serializer = FullReviewerDetailSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+class ReviewerListAPIView(ReviewerListPaginationMixin, APIView): #end point to get the list of all reviewers eg:- ?is_approved=true&subject_area=2,3&institution=MIT&page_size=25
     def get(self, request):
-        reviewers = Reviewer.objects.all()
-        serializer = FullReviewerDetailSerializer(reviewers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.filtered_response(request, get_full_reviewer_queryset())
 
 '''class ReviewerUpdateAPIView(APIView): #end point to update the reviewer profile
     def patch(self, request, reviewer_id, *args, **kwargs):
@@ -129,10 +153,6 @@ class ApproveReviewerAPIView(APIView): #end point to approve the reviewer by the
         except Reviewer.DoesNotExist:
             raise NotFound(detail="Reviewer not found.")
 
-        # Update the 'is_approved' field to True
-        reviewer.is_approved = True
-        reviewer.save()
-
         # Send the approval email
         subject = "Congratulations! Your Reviewership Has Been Approved"
         message = f"Dear {reviewer.user.first_name} {reviewer.user.last_name},\n\n" \
@@ -141,13 +161,11 @@ class ApproveReviewerAPIView(APIView): #end point to approve the reviewer by the
                   "Best regards,\nThe Editorial Team"
         recipient_email = reviewer.user.email
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,  # Your system's default sender email
-            [recipient_email],
-            fail_silently=False
-        )
+        # Update the 'is_approved' field to True and queue the email with it
+        with transaction.atomic():
+            reviewer.is_approved = True
+            reviewer.save()
+            queue_email(subject, message, [recipient_email], settings.DEFAULT_FROM_EMAIL)
 
         return Response({"message": "Reviewer approved successfully and notified via email."}, status=HTTP_200_OK)
     
@@ -158,10 +176,6 @@ class DisapproveReviewerAPIView(APIView): #end point to disapprove the reviewer
         except Reviewer.DoesNotExist:
             raise NotFound(detail="Reviewer not found.")
 
-        # Update the 'is_approved' field to False
-        reviewer.is_approved = False
-        reviewer.save()
-
         # Send the disapproval email
         subject = "Your Reviewership Has Been Disapproved"
         message = f"Dear {reviewer.user.first_name} {reviewer.user.last_name},\n\n" \
@@ -170,13 +184,11 @@ class DisapproveReviewerAPIView(APIView): #end point to disapprove the reviewer
                   "Best regards,\nThe Editorial Team"
         recipient_email = reviewer.user.email
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,  # Your system's default sender email
-            [recipient_email],
-            fail_silently=False
-        )
+        # Update the 'is_approved' field to False and queue the email with it
+        with transaction.atomic():
+            reviewer.is_approved = False
+            reviewer.save()
+            queue_email(subject, message, [recipient_email], settings.DEFAULT_FROM_EMAIL)
 
         return Response({"message": "Reviewer disapproved successfully and notified via email."}, status=HTTP_200_OK)
 
@@ -194,6 +206,28 @@ class ReviewersBySubjectAreaAPIView(APIView): #end point to get the list of appr
         serializer = ReviewerSerializer(reviewers, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+class RankReviewersForJournalAPIView(APIView): #end point to suggest reviewers for a journal ranked by research interest similarity, open load and review history (GET request) eg:- rank/4/?limit=10
+    max_limit = 100
+
+    def get(self, request, journal_id):
+        journal = get_object_or_404(Journal.objects.only('id', 'title', 'abstract', 'keywords', 'subject_area'), id=journal_id)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': "Expected an integer."})
+
+        ranked = rank_reviewers(journal, limit=max(limit, 1))
+        reviewers = Reviewer.objects.select_related('user').in_bulk([reviewer_id for reviewer_id, score, details in ranked])
+        serializer = RankedReviewerSerializer(
+            [reviewers[reviewer_id] for reviewer_id, score, details in ranked if reviewer_id in reviewers],
+            many=True,
+            context={
+                'scores': {reviewer_id: score for reviewer_id, score, details in ranked},
+                'details': {reviewer_id: details for reviewer_id, score, details in ranked},
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 class AssignReviewerToJournalAPIView(APIView): #end point to assign a approved reviewer to a journal
     def post(self, request, reviewer_id, journal_id):
         try:
@@ -206,26 +240,107 @@ class AssignReviewerToJournalAPIView(APIView): #end point to assign a approved r
         except Journal.DoesNotExist:
             raise NotFound("Journal not found.")
 
-        # Check if this reviewer is already assigned to this journal
-        if ReviewerAssignmentHistory.objects.filter(
-            journal=journal, 
-            reviewer=reviewer,
-            status__in=['assigned', 'completed']
-        ).exists():
-            raise ValidationError("This reviewer is already assigned to this journal.")
+        conflicts = conflict_index.get_conflicts(journal.id, [reviewer.id])
+        if conflicts:
+            raise ValidationError(describe_conflicts(conflicts[reviewer.id]))
 
-        # If not, assign
-        assignment = ReviewerAssignmentHistory.objects.create(
-            journal=journal,
-            reviewer=reviewer,
-            subject_area=journal.subject_area  # optional
-        )
+        # The unique_active_reviewer_assignment constraint rejects a second active assignment, even from a concurrent request
+        try:
+            with transaction.atomic():
+                assignment = ReviewerAssignmentHistory.objects.create(
+                    journal=journal,
+                    reviewer=reviewer,
+                    subject_area_id=journal.subject_area_id  # optional
+                )
+        except IntegrityError:
+            raise ValidationError("This reviewer is already assigned to this journal.")
 
         return Response({
             "message": "Reviewer assigned to journal successfully.",
             "assignment_id": assignment.id
         }, status=status.HTTP_201_CREATED)
 
+class BulkAssignReviewersAPIView(APIView): #end point to assign a panel of approved reviewers to a journal in one request (POST request) body {"reviewer_ids": [3, 7, 9]}
+    max_reviewers = 50
+
+    def post(self, request, journal_id):
+        raw_ids = request.data.get('reviewer_ids')
+        if isinstance(raw_ids, str):
+            raw_ids = [value for value in raw_ids.split(',') if value.strip()]
+        try:
+            reviewer_ids = list(dict.fromkeys(int(value) for value in raw_ids or []))  # drop duplicates, keep the order
+        except (TypeError, ValueError):
+            raise ValidationError({'reviewer_ids': "Expected a list of integer ids."})
+        if not reviewer_ids:
+            raise ValidationError({'reviewer_ids': "Pass at least one reviewer id."})
+        if len(reviewer_ids) > self.max_reviewers:
+            raise ValidationError({'reviewer_ids': f"At most {self.max_reviewers} reviewers can be assigned at once."})
+
+        journal = get_object_or_404(Journal.objects.only('id', 'title', 'subject_area_id'), id=journal_id)
+
+        # Approval state and existing active assignments of every requested reviewer in one query
+        active_assignment = ReviewerAssignmentHistory.objects.filter(
+            journal_id=journal.id, reviewer_id=OuterRef('id'), status__in=ReviewerAssignmentHistory.ACTIVE_STATUSES
+        )
+        reviewers = Reviewer.objects.filter(id__in=reviewer_ids).select_related('user').annotate(already_assigned=Exists(active_assignment)).in_bulk()
+        conflicts = conflict_index.get_conflicts(journal.id, reviewers)
+
+        results = {}
+        to_assign = []
+        for reviewer_id in reviewer_ids:
+            reviewer = reviewers.get(reviewer_id)
+            if reviewer is None:
+                results[reviewer_id] = {'success': False, 'error': "Reviewer not found."}
+            elif not reviewer.is_approved:
+                results[reviewer_id] = {'success': False, 'error': "Reviewer is not approved."}
+            elif reviewer.already_assigned:
+                results[reviewer_id] = {'success': False, 'error': "This reviewer is already assigned to this journal."}
+            elif reviewer_id in conflicts:
+                results[reviewer_id] = {'success': False, 'error': describe_conflicts(conflicts[reviewer_id]), 'conflicts': conflicts[reviewer_id]}
+            else:
+                to_assign.append(reviewer)
+
+        if to_assign:
+            try:
+                with transaction.atomic():
+                    ReviewerAssignmentHistory.objects.bulk_create([
+                        ReviewerAssignmentHistory(journal_id=journal.id, reviewer=reviewer, subject_area_id=journal.subject_area_id)
+                        for reviewer in to_assign
+                    ])
+                    queue_emails([
+                        (
+                            "New manuscript assigned for review",
+                            f"Dear {reviewer.user.first_name} {reviewer.user.last_name},\n\n"
+                            f"You have been assigned to review the manuscript \"{journal.title}\". "
+                            "Please log in to the reviewer portal to accept or decline the assignment.\n\n"
+                            "Best regards,\nThe Editorial Team",
+                            [reviewer.user.email],
+                        )
+                        for reviewer in to_assign
+                    ])
+            except IntegrityError:
+                # Another request assigned one of these reviewers between the check and the insert, nothing was saved
+                return Response(
+                    {"error": "Assignments for this journal changed meanwhile, please retry."}, status=status.HTTP_409_CONFLICT
+                )
+
+            invalidate_review_summary(journal.id)  # bulk_create sends no post_save
+
+            # bulk_create doesn't return primary keys on MySQL, so the new ids are read back in one query
+            assignment_ids = dict(
+                ReviewerAssignmentHistory.objects.filter(
+                    journal_id=journal.id, reviewer_id__in=[reviewer.id for reviewer in to_assign], status='assigned'
+                ).values_list('reviewer_id', 'id')
+            )
+            for reviewer in to_assign:
+                results[reviewer.id] = {'success': True, 'assignment_id': assignment_ids.get(reviewer.id)}
+
+        return Response({
+            'assigned': len(to_assign),
+            'failed': len(reviewer_ids) - len(to_assign),
+            'results': {str(reviewer_id): results[reviewer_id] for reviewer_id in reviewer_ids},
+        }, status=status.HTTP_201_CREATED if to_assign else status.HTTP_200_OK)
+
 class RejectAssignedJournalAPIView(APIView): #end point to reject the assigned journal review by the reviewer
     def patch(self, request, assignment_id):
         try:
@@ -348,20 +463,20 @@ class SubmitReviewFeedbackAPIView(APIView):  # endpoint to submit the review fee
 class ReviewerDetailAPIView(APIView):  # Endpoint to get full details of a specific reviewer
     def get(self, request, reviewer_id):
         try:
-            reviewer = Reviewer.objects.get(id=reviewer_id)
+            reviewer = get_full_reviewer_queryset().get(id=reviewer_id)
         except Reviewer.DoesNotExist:
             return Response({'error': 'Reviewer not found'}, status=status.HTTP_404_NOT_FOUND)
 
         serializer = FullReviewerDetailSerializer(reviewer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class ApprovedReviewerListAPIView(ListAPIView): #end point to get list of approved reviewers
-    queryset = Reviewer.objects.filter(is_approved=True)
-    serializer_class = FullReviewerDetailSerializer
+class ApprovedReviewerListAPIView(ReviewerListPaginationMixin, APIView): #end point to get list of approved reviewers, same filters as all-reviewers/
+    def get(self, request):
+        return self.filtered_response(request, get_full_reviewer_queryset().filter(is_approved=True))
 
-class UnApprovedReviewerListAPIView(ListAPIView): #end point to get list of unapproved reviewers
-    queryset = Reviewer.objects.filter(is_approved=False)
-    serializer_class = FullReviewerDetailSerializer
+class UnApprovedReviewerListAPIView(ReviewerListPaginationMixin, APIView): #end point to get list of unapproved reviewers, same filters as all-reviewers/
+    def get(self, request):
+        return self.filtered_response(request, get_full_reviewer_queryset().filter(is_approved=False))
 
 class ReviewerAssignmentHistoryListView(generics.ListAPIView):
     """
@@ -371,15 +486,64 @@ class ReviewerAssignmentHistoryListView(generics.ListAPIView):
     - Reviewer details (name, email, phone)
     """
     serializer_class = ReviewerAssignmentHistorySerializer
+    pagination_class = AssignmentHistoryCursorPagination
     queryset = ReviewerAssignmentHistory.objects.select_related(
         'reviewer__user',
         'subject_area'
-    ).order_by('-assigned_date')
+    ).order_by('-assigned_date', '-id')  # the serializer only reads journal_id, so the journal isn't joined
 
     def get_queryset(self):
-        # You can add additional filtering here if needed
-        return super().get_queryset()
+        # ?status=assigned,completed&reviewer=3&journal=7&subject_area=2&assigned_from=2025-01-01&assigned_to=2025-03-31
+        return filter_assignments(super().get_queryset(), self.request.query_params)
+
+    def paginate_queryset(self, queryset):
+        # The EIC dashboard reads the plain list, paginated clients opt in with ?cursor= or ?page_size=
+        if 'cursor' not in self.request.query_params and 'page_size' not in self.request.query_params:
+            return None
+        return super().paginate_queryset(queryset)
     
+class ReviewerAssignmentExportAPIView(APIView): #end point to download reviewer assignments as csv or ndjson (GET request) eg:- assignments/export/csv/?status=assigned&assigned_from=2025-01-01
+    columns = [
+        ('id', 'id'),
+        ('journal_id', 'journal_id'),
+        ('journal_title', 'journal__title'),
+        ('reviewer_id', 'reviewer_id'),
+        ('reviewer_first_name', 'reviewer__user__first_name'),
+        ('reviewer_last_name', 'reviewer__user__last_name'),
+        ('reviewer_email', 'reviewer__user__email'),
+        ('subject_area', 'subject_area__name'),
+        ('status', 'status'),
+        ('assigned_date', 'assigned_date'),
+        ('completed_date', 'completed_date'),
+        ('rejection_reason', 'rejection_reason'),
+    ]
+
+    def get(self, request, export_format, *args, **kwargs):
+        assignments = filter_assignments(ReviewerAssignmentHistory.objects.all(), request.query_params)
+        return export_response(assignments, self.columns, export_format, 'reviewer-assignments')
+
+class ReviewFeedbackExportAPIView(APIView): #end point to download review feedback as csv or ndjson (GET request) eg:- review-feedback/export/ndjson/?journal=4&recommendation=accept
+    columns = [
+        ('id', 'id'),
+        ('journal_id', 'journal_id'),
+        ('journal_title', 'journal__title'),
+        ('reviewer_id', 'reviewer_id'),
+        ('reviewer_first_name', 'reviewer__user__first_name'),
+        ('reviewer_last_name', 'reviewer__user__last_name'),
+        ('rating', 'rating'),
+        ('recommendation', 'recommendation'),
+        ('feedback_text', 'feedback_text'),
+        ('confidential_comments', 'confidential_comments'),
+        ('is_final_submission', 'is_final_submission'),
+        ('review_date', 'review_date'),
+        ('updated_at', 'updated_at'),
+        ('file_upload', 'file_upload'),
+    ]
+
+    def get(self, request, export_format, *args, **kwargs):
+        feedbacks = filter_feedback(ReviewFeedback.objects.all(), request.query_params)
+        return export_response(feedbacks, self.columns, export_format, 'review-feedback')
+
 # views.py
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -387,6 +551,13 @@ from rest_framework import status
 from .models import ReviewFeedback
 from .serializers import ReviewFeedbackSerializer
 
+class JournalReviewSummaryAPIView(APIView): #end point to get the rating mean and distribution, recommendation counts and assignment progress of a journal (GET request)
+    def get(self, request, journal_id):
+        summary = get_review_summary(journal_id)
+        if summary is None:
+            raise NotFound("Journal not found.")
+        return Response(summary, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 def review_feedback_by_journal(request, journal_id): #end point to get feedback of the reviewer by the journal id
     feedbacks = ReviewFeedback.objects.filter(journal_id=journal_id)
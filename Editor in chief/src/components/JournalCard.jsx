@@ -10,6 +10,10 @@ const JournalCard = ({ journal }) => {
     setIframeKey(prevKey => prevKey + 1);
   };
 
+  // Manuscripts under review are access checked by the backend, iframes and links can't send headers so the token goes in the URL
+  const token = localStorage.getItem('token');
+  const manuscriptUrl = `${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}${token ? `?token=${encodeURIComponent(token)}` : ''}`;
+
   return (
     <div className="row p-4 pb-0 pe-lg-0 pt-lg-5 align-items-center rounded-3 border shadow-lg mb-4">
       <div className="col-lg-8 p-3 p-lg-5 pt-lg-3">
@@ -35,7 +39,7 @@ const JournalCard = ({ journal }) => {
             {showPdf ? 'Hide Manuscript' : 'View Manuscript'}
           </button>
           <a
-            href={journal.manuscript_file}
+            href={manuscriptUrl}
             className="btn btn-outline-secondary btn-sm px-4"
             target="_blank"
             rel="noopener noreferrer"
@@ -50,7 +54,7 @@ const JournalCard = ({ journal }) => {
             {journal.manuscript_file ? (
               <iframe 
                 key={iframeKey}
-                src={`${`${import.meta.env.VITE_BACKEND_DJANGO_URL}`+journal.manuscript_file}#view=fitH`}
+                src={`${manuscriptUrl}#view=fitH`}
                 title="Journal Manuscript"
                 width="100%"
                 height="100%"
@@ -58,7 +62,7 @@ const JournalCard = ({ journal }) => {
                 onError={() => console.error('Failed to load PDF')}
               >
                 <p>Your browser does not support iframes. 
-                  <a href={journal.manuscript_file} download>Download PDF instead</a>
+                  <a href={manuscriptUrl} download>Download PDF instead</a>
                 </p>
               </iframe>
             ) : (
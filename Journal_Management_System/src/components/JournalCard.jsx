@@ -10,6 +10,10 @@ const JournalCard = ({ journal }) => {
     setIframeKey(prevKey => prevKey + 1);
   };
 
+  // Manuscripts under review are access checked by the backend, iframes and links can't send headers so the token goes in the URL
+  const token = localStorage.getItem('token');
+  const manuscriptUrl = `${import.meta.env.VITE_BACKEND_DJANGO_URL}${journal.manuscript_file}${token ? `?token=${encodeURIComponent(token)}` : ''}`;
+
   return (
     <div className="journal-card">
       <div className="journal-content">
@@ -45,7 +49,7 @@ const JournalCard = ({ journal }) => {
             )}
           </button>
           <a
-            href={journal.manuscript_file}
+            href={manuscriptUrl}
             className="download-btn"
             target="_blank"
             rel="noopener noreferrer"
@@ -60,13 +64,13 @@ const JournalCard = ({ journal }) => {
             {journal.manuscript_file ? (
               <iframe 
                 key={iframeKey}
-                src={`${`${import.meta.env.VITE_BACKEND_DJANGO_URL}`+journal.manuscript_file}#view=fitH`}
+                src={`${manuscriptUrl}#view=fitH`}
                 title="Journal Manuscript"
                 className="pdf-iframe"
                 onError={() => console.error('Failed to load PDF')}
               >
                 <p>Your browser does not support iframes. 
-                  <a href={journal.manuscript_file} download>Download PDF instead</a>
+                  <a href={manuscriptUrl} download>Download PDF instead</a>
                 </p>
               </iframe>
             ) : (